@@ -6,32 +6,46 @@ import os
 import re
 import time
 import threading
+import multiprocessing
+import subprocess
+import collections
+import heapq
+import queue
+import contextlib
+import concurrent.futures
 import io
+import tempfile
+import shutil
 import random
 import datetime
 import uuid
 import jwt
 import json
 import secrets
+import hashlib
+import sqlite3
+import gzip
+import zlib
+import struct
 from functools import wraps
 from flask import Flask, render_template, request, jsonify, send_from_directory, Response, redirect, url_for, session
 from werkzeug.utils import secure_filename
-import whisper
+from werkzeug.http import parse_etags
 from deep_translator import GoogleTranslator
 from passlib.context import CryptContext
 
-# --- REPORTLAB IMPORTS ---
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont   # handles CJK with zero font files
+# --- PDF RENDERING (ReportLab) ---
+from pdf_render import render_worker_init, render_pdf_task
 
-# --- TORCH AND TRANSFORMERS IMPORTS (For BART Summarization) ---
-import torch
-from transformers import BartForConditionalGeneration, BartTokenizer
+try:
+    import brotli   # optional: enables br compression
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl    # POSIX only: file locks shared between worker processes
+except ImportError:
+    fcntl = None
 
 # --- GROQ API IMPORT ---
 from groq import Groq
@@ -47,6 +61,12 @@ from google.auth.transport import requests as google_requests
 from google_auth_oauthlib.flow import Flow
 
 app = Flask(__name__)
+
+# Spawned inference and PDF render workers re-import this module (as
+# __mp_main__ under `python app.py`). Startup side effects that belong to the
+# web process only - sweepers, migrations, warm-up - check this flag. The
+# process name is set before the re-import; parent_process() is not yet.
+IS_WORKER_PROCESS = multiprocessing.current_process().name != 'MainProcess'
 app.secret_key = os.getenv("SECRET_KEY", "transcribe_flow_secret_key_change_in_production")
 
 # ============================================================
@@ -79,33 +99,350 @@ os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 # ============================================================
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 ALGORITHM = "HS256"
-DB_FILE = "users.json"
+DB_FILE = os.getenv("USERS_DB", "users.db")
+LEGACY_DB_FILE = "users.json"
+
+# ============================================================
+# EXPIRING STORE (OTPs & RESET TOKENS)
+# ============================================================
+# OTPs and reset tokens live in a TTL store: entries vanish when they expire,
+# a background sweeper reclaims abandoned ones via a time-ordered index and
+# the store is capped in size. EXPIRING_STORE_BACKEND=sqlite keeps them in a
+# shared file so any worker process can verify an OTP issued by another.
+EXPIRING_STORE_BACKEND     = os.getenv("EXPIRING_STORE_BACKEND", "memory")
+EXPIRING_STORE_DB          = os.getenv("EXPIRING_STORE_DB", "auth_tokens.db")
+EXPIRING_STORE_MAX_ENTRIES = int(os.getenv("EXPIRING_STORE_MAX_ENTRIES", 100000))
+EXPIRING_STORE_SWEEP_SEC   = int(os.getenv("EXPIRING_STORE_SWEEP_SEC", 60))
+OTP_MAX_ATTEMPTS           = int(os.getenv("OTP_MAX_ATTEMPTS", 5))
+
+
+class ExpiringStore:
+    """In-process TTL store with a min-heap expiry index and an entry cap."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data  = {}      # key -> [value, expires_at, attempts]
+        self._heap  = []      # (expires_at, key); stale items are skipped lazily
+        self._lock  = threading.Lock()
+
+    def set(self, key, value: dict, ttl_sec: float) -> None:
+        expires_at = time.time() + ttl_sec
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_entries:
+                self._sweep_locked(time.time())
+                if len(self._data) >= self.max_entries:
+                    self._evict_soonest_locked()
+            old = self._data.get(key)
+            self._data[key] = [value, expires_at, 0]
+            if not old or old[1] != expires_at:
+                heapq.heappush(self._heap, (expires_at, key))
+                self._compact_locked()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return None
+            if entry[1] <= time.time():
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def pop(self, key) -> None:
+        with self._lock:
+            if self._data.pop(key, None):
+                self._compact_locked()
+
+    def incr_attempts(self, key) -> int:
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return 0
+            entry[2] += 1
+            return entry[2]
+
+    def _compact_locked(self):
+        # Overwritten and popped keys leave stale heap items behind; rebuild the
+        # heap once they outnumber the live entries, so it stays O(len(_data)).
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [(entry[1], key) for key, entry in self._data.items()]
+            heapq.heapify(self._heap)
+
+    def _evict_soonest_locked(self):
+        while self._heap:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry and entry[1] == expires_at:
+                del self._data[key]
+                return
+
+    def _sweep_locked(self, now) -> int:
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry and entry[1] == expires_at:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._sweep_locked(time.time())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteExpiringStore:
+    """Same interface as ExpiringStore, backed by a SQLite file shared between processes."""
+
+    def __init__(self, db_path: str, namespace: str, max_entries: int):
+        self.db_path     = db_path
+        self.namespace   = namespace
+        self.max_entries = max_entries
+        self._local      = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS expiring (
+                namespace  TEXT NOT NULL,
+                key        TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                attempts   INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_expiring_expires_at ON expiring(expires_at);
+        """)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    def set(self, key, value: dict, ttl_sec: float) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO expiring (namespace, key, value, expires_at, attempts)"
+                " VALUES (?, ?, ?, ?, 0)",
+                (self.namespace, key, json.dumps(value), time.time() + ttl_sec)
+            )
+            count = conn.execute(
+                "SELECT COUNT(*) FROM expiring WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM expiring WHERE namespace = ? AND key IN ("
+                    " SELECT key FROM expiring WHERE namespace = ? ORDER BY expires_at LIMIT ?)",
+                    (self.namespace, self.namespace, count - self.max_entries)
+                )
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM expiring WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pop(self, key) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM expiring WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def incr_attempts(self, key) -> int:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "UPDATE expiring SET attempts = attempts + 1 WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            row = conn.execute(
+                "SELECT attempts FROM expiring WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def sweep(self) -> int:
+        conn = self._conn()
+        with conn:
+            return conn.execute(
+                "DELETE FROM expiring WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time())
+            ).rowcount
+
+    def __len__(self):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM expiring WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
 
-reset_tokens = {}
-otp_store = {}
+def make_expiring_store(namespace: str):
+    if EXPIRING_STORE_BACKEND == 'sqlite':
+        return SQLiteExpiringStore(EXPIRING_STORE_DB, namespace, EXPIRING_STORE_MAX_ENTRIES)
+    return ExpiringStore(EXPIRING_STORE_MAX_ENTRIES)
+
+
+reset_tokens = make_expiring_store('reset_tokens')
+otp_store    = make_expiring_store('otp')
+
+
+def _sweep_expiring_stores():
+    while True:
+        time.sleep(EXPIRING_STORE_SWEEP_SEC)
+        for store in (otp_store, reset_tokens):
+            try:
+                store.sweep()
+            except Exception as e:
+                print(f"Expiring store sweep error: {e}")
+
+
+if not IS_WORKER_PROCESS:
+    threading.Thread(target=_sweep_expiring_stores, name="expiring-store-sweeper", daemon=True).start()
 
 # ============================================================
 # DATABASE HELPERS
 # ============================================================
-def load_users():
-    if os.path.exists(DB_FILE):
+# Users live in SQLite (WAL mode) with unique indexes on email and normalised
+# phone, so lookups are indexed and each registration / password reset is a
+# single-row write. The old users.json is migrated once on first start.
+def normalise_phone(phone: str) -> str:
+    digits = re.sub(r'[\s\-\(\)]', '', phone)
+    return digits
+
+
+class UserStore:
+    """SQLite-backed user table with one connection per thread."""
+
+    COLUMNS = ("email", "user_id", "name", "phone", "password_hash", "registered_on")
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local  = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS users (
+                email          TEXT PRIMARY KEY,
+                user_id        TEXT NOT NULL UNIQUE,
+                name           TEXT NOT NULL,
+                phone          TEXT NOT NULL DEFAULT '',
+                phone_norm     TEXT NOT NULL DEFAULT '',
+                password_hash  TEXT NOT NULL DEFAULT '',
+                registered_on  TEXT NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_users_phone_norm
+                ON users(phone_norm) WHERE phone_norm != '';
+        """)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row(self, row):
+        return {k: row[k] for k in self.COLUMNS} if row else None
+
+    def get(self, email: str):
+        row = self._conn().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return self._row(row)
+
+    def exists(self, email: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone() is not None
+
+    def find_by_phone(self, phone: str):
+        norm = normalise_phone(phone)
+        if not norm:
+            return None
+        row = self._conn().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM users WHERE phone_norm = ?", (norm,)
+        ).fetchone()
+        return self._row(row)
+
+    def _insert(self, conn, record: dict, verb: str = "INSERT") -> int:
+        return conn.execute(
+            f"{verb} INTO users (email, user_id, name, phone, phone_norm, password_hash, registered_on)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (record['email'], record['user_id'], record['name'], record.get('phone', ''),
+             normalise_phone(record.get('phone', '')), record.get('password_hash', ''),
+             record['registered_on'])
+        ).rowcount
+
+    def insert(self, record: dict) -> None:
+        """Insert a new user. Raises sqlite3.IntegrityError if the email or phone is taken."""
+        conn = self._conn()
+        with conn:
+            self._insert(conn, record)
+
+    def update_password(self, email: str, password_hash: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE email = ?", (password_hash, email))
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        One-time import of the legacy users.json. Returns the number of users imported.
+
+        The import is a single BEGIN IMMEDIATE transaction: it either lands
+        whole or not at all, and a second worker starting at the same time
+        waits, then finds the table filled and does nothing. The file is
+        renamed to .migrated only after the commit.
+        """
+        if not os.path.exists(json_path):
+            return 0
         try:
-            with open(DB_FILE, 'r') as f:
-                return json.load(f)
+            with open(json_path, 'r') as f:
+                legacy = json.load(f)
         except Exception as e:
-            print(f"Error loading database: {e}")
-            return {}
-    return {}
+            print(f"Error loading legacy database: {e}")
+            return 0
 
-def save_users():
-    try:
-        with open(DB_FILE, 'w') as f:
-            json.dump(users_db, f, indent=4)
-    except Exception as e:
-        print(f"Error saving database: {e}")
-
-users_db = load_users()
-print(f"Database loaded. {len(users_db)} users found.")
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.count():
+                conn.rollback()
+                return 0
+            imported = 0
+            for email, record in legacy.items():
+                record = dict(record, email=record.get('email') or email)
+                record.setdefault('user_id', str(uuid.uuid4()))
+                record.setdefault('registered_on', datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                if self._insert(conn, record, "INSERT OR IGNORE"):
+                    imported += 1
+                elif record.get('phone') and self._insert(conn, dict(record, phone=''), "INSERT OR IGNORE"):
+                    # Duplicate phone in the old file: keep the account, drop the phone.
+                    print(f"WARNING: Duplicate phone for {email} during migration; phone cleared.")
+                    imported += 1
+                else:
+                    print(f"WARNING: Skipped {email} during migration: email or user_id already taken.")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        with contextlib.suppress(FileNotFoundError):
+            os.replace(json_path, json_path + ".migrated")
+        print(f"Migrated {imported} users from {json_path} to {self.db_path}.")
+        return imported
+
+
+user_store = UserStore(DB_FILE)
+if not IS_WORKER_PROCESS:
+    user_store.migrate_from_json(LEGACY_DB_FILE)
+    print(f"Database loaded. {user_store.count()} users found.")
 
 # ============================================================
 # UPLOAD CONFIG
@@ -118,27 +455,887 @@ app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
-processing_jobs = {}
+# ============================================================
+# JOB STATE & EVENTS
+# ============================================================
+# Job state (status, stage, progress, errors, results) lives in a JobStore.
+# The default in-memory store serves a single process; JOB_STORE_BACKEND=sqlite
+# keeps it in a shared file so any web worker can answer /check_status without
+# sticky sessions. Decoded segments are kept in their own append-only list so
+# publishing one does not rewrite the whole state.
+#
+# All changes go through set_job / update_job, which also publish a snapshot
+# to every local subscriber of that job (the SSE progress streams). Every
+# write bumps the job's 'version', which is how streams in other processes
+# notice changes with a cheap point read.
+JOB_TERMINAL_STATES = ('completed', 'error')
+JOB_STORE_BACKEND   = os.getenv("JOB_STORE_BACKEND", "memory")
+JOB_STORE_DB        = os.getenv("JOB_STORE_DB", "jobs.db")
+JOB_STATE_TTL_SEC   = int(os.getenv("JOB_STATE_TTL_HOURS", 24)) * 3600
+
+
+class MemoryJobStore:
+    """Job state for a single process."""
+
+    shared = False
+
+    def __init__(self):
+        self._jobs     = {}
+        self._segments = collections.defaultdict(list)
+        self._lock     = threading.Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            state = self._jobs.get(job_id)
+            return dict(state) if state is not None else None
+
+    def set(self, job_id, state: dict) -> dict:
+        with self._lock:
+            version = self._jobs.get(job_id, {}).get('version', 0) + 1
+            self._jobs[job_id] = dict(state, version=version, updated_at=time.time())
+            self._segments.pop(job_id, None)
+            return dict(self._jobs[job_id])
+
+    def update(self, job_id, fields: dict) -> dict:
+        with self._lock:
+            state = self._jobs.setdefault(job_id, {'version': 0})
+            state.update(fields)
+            state['version'] += 1
+            state['updated_at'] = time.time()
+            return dict(state)
+
+    def delete(self, job_id) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._segments.pop(job_id, None)
+
+    def append_segment(self, job_id, segment: dict) -> int:
+        with self._lock:
+            self._segments[job_id].append(segment)
+            return len(self._segments[job_id])
+
+    def segments(self, job_id, since: int = 0) -> list:
+        with self._lock:
+            return list(self._segments.get(job_id, [])[since:])
+
+
+class SQLiteJobStore:
+    """Job state shared between processes through a SQLite file (WAL mode)."""
+
+    shared = True
+
+    def __init__(self, db_path: str, ttl_sec: int):
+        self.db_path = db_path
+        self.ttl_sec = ttl_sec
+        self._local  = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id     TEXT PRIMARY KEY,
+                state      TEXT NOT NULL,
+                version    INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_updated_at ON jobs(updated_at);
+            CREATE TABLE IF NOT EXISTS job_segments (
+                job_id TEXT NOT NULL,
+                idx    INTEGER NOT NULL,
+                data   TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+        """)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, job_id):
+        row = self._conn().execute("SELECT state, version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        return dict(json.loads(row[0]), version=row[1])
+
+    def _write(self, job_id, mutate, reset_segments: bool = False) -> dict:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if reset_segments:
+                conn.execute("DELETE FROM job_segments WHERE job_id = ?", (job_id,))
+            row = conn.execute("SELECT state, version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            state, version = (json.loads(row[0]), row[1]) if row else ({}, 0)
+            state = mutate(state)
+            now = time.time()
+            state['updated_at'] = now
+            state.pop('version', None)
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, state, version, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(state), version + 1, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._writes += 1
+        if self._writes % 500 == 0:
+            self._purge_stale()
+        return dict(state, version=version + 1)
+
+    def set(self, job_id, state: dict) -> dict:
+        # Replacing the state starts a new run: its segments go in the same transaction.
+        return self._write(job_id, lambda _: dict(state), reset_segments=True)
+
+    def update(self, job_id, fields: dict) -> dict:
+        return self._write(job_id, lambda state: dict(state, **fields))
+
+    def delete(self, job_id) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM job_segments WHERE job_id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def append_segment(self, job_id, segment: dict) -> int:
+        idx = segment['index']
+        self._conn().execute(
+            "INSERT OR REPLACE INTO job_segments (job_id, idx, data) VALUES (?, ?, ?)",
+            (job_id, idx, json.dumps(segment))
+        )
+        return idx + 1
+
+    def segments(self, job_id, since: int = 0) -> list:
+        rows = self._conn().execute(
+            "SELECT data FROM job_segments WHERE job_id = ? AND idx >= ? ORDER BY idx", (job_id, since)
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def _purge_stale(self):
+        cutoff = time.time() - self.ttl_sec
+        conn = self._conn()
+        stale = [r[0] for r in conn.execute("SELECT job_id FROM jobs WHERE updated_at < ?", (cutoff,))]
+        for job_id in stale:
+            self.delete(job_id)
+
+
+class JobEventHub:
+    """Fan-out of job state changes to per-subscriber queues."""
+
+    def __init__(self, max_backlog: int = 100):
+        self.max_backlog  = max_backlog
+        self._subscribers = collections.defaultdict(set)
+        self._lock        = threading.Lock()
+
+    def subscribe(self, job_id) -> queue.Queue:
+        q = queue.Queue(maxsize=self.max_backlog)
+        with self._lock:
+            self._subscribers[job_id].add(q)
+        return q
+
+    def unsubscribe(self, job_id, q) -> None:
+        with self._lock:
+            subs = self._subscribers.get(job_id)
+            if subs:
+                subs.discard(q)
+                if not subs:
+                    del self._subscribers[job_id]
+
+    def publish(self, job_id, event: dict) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(job_id, ()))
+        for q in subs:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: drop its oldest update, the latest snapshot matters
+                # most. Another publisher may still refill the freed slot first;
+                # the subscriber then has a newer event anyway, so never raise.
+                with self._lock:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    try:
+                        q.put_nowait(event)
+                    except queue.Full:
+                        pass
+
+
+job_store = SQLiteJobStore(JOB_STORE_DB, JOB_STATE_TTL_SEC) if JOB_STORE_BACKEND == 'sqlite' else MemoryJobStore()
+job_events = JobEventHub()
+
+
+def get_job(job_id):
+    return job_store.get(job_id)
+
+
+def set_job(job_id, state: dict) -> None:
+    job_events.publish(job_id, job_store.set(job_id, state))
+
+
+def update_job(job_id, **fields) -> None:
+    job_events.publish(job_id, job_store.update(job_id, fields))
+
+
+def delete_job(job_id) -> None:
+    job_store.delete(job_id)
+
+
+def append_job_segment(job_id, segment: dict) -> None:
+    count = job_store.append_segment(job_id, segment)
+    update_job(job_id, segment_count=count)
+
+
+def get_job_segments(job_id, since: int = 0) -> list:
+    return job_store.segments(job_id, since)
 
 # ============================================================
 # MODELS LOADING
 # ============================================================
-print("Loading Whisper Model...")
-try:
-    model = whisper.load_model("base")
-    print("Whisper Model Loaded Successfully.")
-except Exception as e:
-    print(f"CRITICAL ERROR: Could not load Whisper model. Details: {e}")
-
-print("Loading BART Summarization Model...")
-summ_model = None
-summ_tokenizer = None
-try:
-    summ_tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn")
-    summ_model = BartForConditionalGeneration.from_pretrained("facebook/bart-large-cnn")
-    print("BART Model Loaded Successfully.")
-except Exception as e:
-    print(f"WARNING: Could not load BART model. Details: {e}")
+# Models are loaded lazily on first use so the web tier starts instantly and
+# auth-only processes never pay for them. torch / whisper / transformers are
+# imported inside the loaders for the same reason.
+WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
+BART_MODEL_NAME    = os.getenv("BART_MODEL", "facebook/bart-large-cnn")
+PRELOAD_MODELS     = os.getenv("PRELOAD_MODELS", "0") == "1"
+ADMIN_TOKEN        = os.getenv("ADMIN_TOKEN")
+
+# 'thread' runs inference inside this process; 'process' sends it to a pool
+# of long-lived worker processes (see INFERENCE BACKEND below).
+INFERENCE_BACKEND  = os.getenv("INFERENCE_BACKEND", "thread")
+
+
+def use_process_backend() -> bool:
+    # Inside a worker process inference always runs locally.
+    return INFERENCE_BACKEND == 'process' and not IS_WORKER_PROCESS
+
+
+class LazyModel:
+    """Loads a model the first time it is requested and keeps it for the process lifetime."""
+
+    def __init__(self, name: str, loader):
+        self.name         = name
+        self._loader      = loader
+        self._value       = None
+        self._lock        = threading.Lock()
+        self.state        = 'unloaded'      # unloaded | loading | ready | error
+        self.error        = None
+        self.load_seconds = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def get(self):
+        """Return the loaded model, loading it first if needed. Raises on load failure."""
+        if self._value is not None:
+            return self._value
+        with self._lock:
+            if self._value is None:
+                self.state = 'loading'
+                print(f"Loading {self.name}...")
+                started = time.time()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.state = 'error'
+                    self.error = str(e)
+                    raise
+                self.load_seconds = round(time.time() - started, 2)
+                self.state = 'ready'
+                self.error = None
+                print(f"{self.name} Loaded Successfully ({self.load_seconds}s).")
+        return self._value
+
+    def status(self) -> dict:
+        return {'state': self.state, 'error': self.error, 'load_seconds': self.load_seconds}
+
+
+# Approximate fp32 resident size of each Whisper variant, used to make room
+# before a load. The real size is measured from the parameters afterwards.
+WHISPER_MODEL_SIZES_MB = {
+    'tiny': 150, 'base': 290, 'small': 970, 'medium': 3060, 'large': 6200,
+}
+WHISPER_QUALITY_PRESETS = {
+    'fast': 'tiny', 'balanced': 'base', 'accurate': 'small', 'best': 'medium',
+}
+WHISPER_ALLOWED_MODELS = [
+    m.strip() for m in os.getenv("WHISPER_ALLOWED_MODELS", "tiny,base,small,medium").split(",") if m.strip()
+]
+WHISPER_RAM_BUDGET_MB = int(os.getenv("WHISPER_RAM_BUDGET_MB", 2048))
+
+
+def resolve_whisper_model(requested: str) -> str:
+    """Map a model name or quality preset to an allowed Whisper model. Raises ValueError."""
+    name = (requested or WHISPER_MODEL_NAME).strip().lower()
+    name = WHISPER_QUALITY_PRESETS.get(name, name)
+    if name not in WHISPER_ALLOWED_MODELS and name != WHISPER_MODEL_NAME:
+        allowed = sorted(set(WHISPER_ALLOWED_MODELS) | set(WHISPER_QUALITY_PRESETS))
+        raise ValueError(f"Unknown model '{requested}'. Allowed: {', '.join(allowed)}")
+    return name
+
+
+def _model_size_mb(model) -> float:
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return round(sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+class WhisperRegistry:
+    """
+    Keeps several Whisper variants loaded under a RAM budget.
+
+    Models are kept in LRU order; loading a new one evicts the least recently
+    used variants that are not currently transcribing until it fits.
+    """
+
+    def __init__(self, budget_mb: int):
+        self.budget_mb = budget_mb
+        self._models   = collections.OrderedDict()   # name -> (model, size_mb)
+        self._in_use   = collections.Counter()
+        self._loading  = {}                          # name -> per-model load lock
+        self._running  = {}                          # name -> per-model inference lock
+        self._lock     = threading.Lock()
+        self._stats    = collections.defaultdict(lambda: {
+            'loads': 0, 'hits': 0, 'evictions': 0, 'load_seconds': None, 'size_mb': None, 'error': None
+        })
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return name in self._models
+
+    @contextlib.contextmanager
+    def acquire(self, name: str, exclusive: bool = False):
+        """
+        Yield the named model, pinned against eviction for the duration of the block.
+
+        With exclusive=True the block also holds the model's inference lock:
+        Whisper's decoder installs hooks on the shared model, so two threads
+        must never transcribe with the same instance at once.
+        """
+        model = self._checkout(name)
+        try:
+            if exclusive:
+                with self._lock:
+                    run_lock = self._running.setdefault(name, threading.Lock())
+                with run_lock:
+                    yield model
+            else:
+                yield model
+        finally:
+            with self._lock:
+                self._in_use[name] -= 1
+
+    def _checkout_loaded(self, name):
+        # Caller holds self._lock.
+        model, _ = self._models[name]
+        self._models.move_to_end(name)
+        self._in_use[name] += 1
+        self._stats[name]['hits'] += 1
+        return model
+
+    def _checkout(self, name: str):
+        with self._lock:
+            if name in self._models:
+                return self._checkout_loaded(name)
+            load_lock = self._loading.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    return self._checkout_loaded(name)
+                self._evict_for(WHISPER_MODEL_SIZES_MB.get(name, 1000))
+
+            import whisper
+            print(f"Loading Whisper Model '{name}'...")
+            started = time.time()
+            try:
+                model = whisper.load_model(name)
+            except Exception as e:
+                with self._lock:
+                    self._stats[name]['error'] = str(e)
+                raise
+            elapsed = round(time.time() - started, 2)
+            size_mb = _model_size_mb(model) or WHISPER_MODEL_SIZES_MB.get(name, 1000)
+            print(f"Whisper Model '{name}' Loaded Successfully ({elapsed}s, {size_mb} MB).")
+
+            with self._lock:
+                self._models[name] = (model, size_mb)
+                self._in_use[name] += 1
+                stats = self._stats[name]
+                stats.update({'load_seconds': elapsed, 'size_mb': size_mb, 'error': None})
+                stats['loads'] += 1
+                self._evict_for(0)
+            return model
+
+    def _evict_for(self, needed_mb: float):
+        # Caller holds self._lock. Evict idle models, least recently used first.
+        used = sum(size for _, size in self._models.values())
+        for name in list(self._models):
+            if used + needed_mb <= self.budget_mb:
+                break
+            if self._in_use[name] > 0:
+                continue
+            _, size = self._models.pop(name)
+            used -= size
+            self._stats[name]['evictions'] += 1
+            print(f"Evicted Whisper Model '{name}' ({size} MB) to stay within {self.budget_mb} MB.")
+        if used + needed_mb > self.budget_mb:
+            print(f"WARNING: Whisper models in use exceed the {self.budget_mb} MB budget.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'budget_mb': self.budget_mb,
+                'used_mb':   round(sum(size for _, size in self._models.values()), 1),
+                'loaded':    list(self._models),
+                'models':    {name: dict(st, in_use=self._in_use[name]) for name, st in self._stats.items()},
+            }
+
+
+def _load_bart():
+    from transformers import BartForConditionalGeneration, BartTokenizer
+    tokenizer = BartTokenizer.from_pretrained(BART_MODEL_NAME)
+    model     = BartForConditionalGeneration.from_pretrained(BART_MODEL_NAME)
+    return model, tokenizer
+
+
+def _load_bart_tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(BART_MODEL_NAME)
+
+
+whisper_registry = WhisperRegistry(WHISPER_RAM_BUDGET_MB)
+bart_provider    = LazyModel("BART Summarization Model", _load_bart)
+bart_tokenizer   = LazyModel("BART Tokenizer", _load_bart_tokenizer)
+
+MODEL_PROVIDERS = {'bart': bart_provider}
+
+
+def get_summarizer():
+    """Return (model, tokenizer) for BART, or (None, None) if it cannot be loaded."""
+    try:
+        return bart_provider.get()
+    except Exception as e:
+        print(f"WARNING: Could not load BART model. Details: {e}")
+        return None, None
+
+
+def get_summary_tokenizer():
+    """Return the BART tokenizer without loading the model weights, or None."""
+    if bart_provider.loaded:
+        return bart_provider.get()[1]
+    try:
+        return bart_tokenizer.get()
+    except Exception as e:
+        print(f"WARNING: Could not load BART tokenizer. Details: {e}")
+        return None
+
+
+def model_status() -> dict:
+    status = {name: p.status() for name, p in MODEL_PROVIDERS.items()}
+    status['whisper'] = whisper_registry.stats()
+    return status
+
+
+def warmup_models(names=None) -> dict:
+    """
+    Load the named models and return their status.
+
+    Names are 'bart', 'whisper' (the default variant) or 'whisper:<size>'.
+    """
+    for name in (names or ['whisper', 'bart']):
+        try:
+            if name.startswith('whisper'):
+                size = name.split(':', 1)[1] if ':' in name else WHISPER_MODEL_NAME
+                with whisper_registry.acquire(resolve_whisper_model(size)):
+                    pass
+            elif name in MODEL_PROVIDERS:
+                MODEL_PROVIDERS[name].get()
+        except Exception as e:
+            print(f"Warm-up failed for {name}: {e}")
+    return model_status()
+
+
+# With the process backend each inference worker preloads its own models when
+# it starts (see _inference_worker_main); nothing warms up on import in a worker.
+if PRELOAD_MODELS and not IS_WORKER_PROCESS and INFERENCE_BACKEND != 'process':
+    threading.Thread(target=warmup_models, name="model-warmup", daemon=True).start()
+
+# ============================================================
+# JOB SCHEDULER
+# ============================================================
+# A bounded queue feeding a fixed pool of inference workers. Uploads are
+# queued instead of each spawning its own thread, so concurrent uploads
+# wait their turn rather than fighting over the models and CPU cores.
+TRANSCRIBE_WORKERS    = max(1, int(os.getenv("TRANSCRIBE_WORKERS", 1)))
+TRANSCRIBE_QUEUE_SIZE = max(1, int(os.getenv("TRANSCRIBE_QUEUE_SIZE", 20)))
+
+
+class JobScheduler:
+    """Fixed-size worker pool over a bounded FIFO of pending jobs."""
+
+    def __init__(self, num_workers: int, max_queue: int):
+        self.num_workers  = num_workers
+        self.max_queue    = max_queue
+        self._pending     = collections.deque()   # (job_id, fn, args, queued_at)
+        self._running     = set()
+        self._cond        = threading.Condition()
+        self._avg_runtime = None                  # moving average, seconds
+        self._workers     = []
+        self._reserved    = 0                     # slots held for submit(..., reserved=True)
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        for i in range(self.num_workers):
+            t = threading.Thread(target=self._worker_loop, name=f"transcribe-worker-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def is_full(self) -> bool:
+        with self._cond:
+            return len(self._pending) + self._reserved >= self.max_queue
+
+    def reserve(self) -> bool:
+        """Hold a queue slot for a job about to be submitted. False if the queue is full."""
+        with self._cond:
+            if len(self._pending) + self._reserved >= self.max_queue:
+                return False
+            self._reserved += 1
+            return True
+
+    def release(self) -> None:
+        """Give back a slot from reserve() that will not be used."""
+        with self._cond:
+            self._reserved -= 1
+
+    def submit(self, job_id, fn, *args, reserved: bool = False):
+        """
+        Queue a job. Returns its 1-based queue position, or None if the queue is
+        full. With reserved=True it uses a slot taken by reserve() and always succeeds.
+        """
+        with self._cond:
+            self._ensure_workers()
+            if reserved:
+                self._reserved -= 1
+            elif len(self._pending) + self._reserved >= self.max_queue:
+                return None
+            self._pending.append((job_id, fn, args, time.time()))
+            self._cond.notify()
+            return len(self._pending)
+
+    def position(self, job_id):
+        """1-based position of a job still waiting in the queue, else None."""
+        with self._cond:
+            for i, entry in enumerate(self._pending):
+                if entry[0] == job_id:
+                    return i + 1
+        return None
+
+    def estimated_wait(self, position: int):
+        """Rough seconds until a job at `position` starts, from recent job runtimes."""
+        if self._avg_runtime is None or not position:
+            return None
+        batches = (position - 1) // self.num_workers + 1
+        return round(batches * self._avg_runtime, 1)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'workers':         self.num_workers,
+                'queued':          len(self._pending),
+                'running':         len(self._running),
+                'max_queue':       self.max_queue,
+                'avg_runtime_sec': round(self._avg_runtime, 1) if self._avg_runtime else None,
+            }
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job_id, fn, args, queued_at = self._pending.popleft()
+                self._running.add(job_id)
+
+            started = time.time()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Worker error for job {job_id}: {e}")
+            finally:
+                elapsed = time.time() - started
+                with self._cond:
+                    self._running.discard(job_id)
+                    self._avg_runtime = elapsed if self._avg_runtime is None \
+                        else 0.8 * self._avg_runtime + 0.2 * elapsed
+
+
+job_scheduler = JobScheduler(TRANSCRIBE_WORKERS, TRANSCRIBE_QUEUE_SIZE)
+
+# ============================================================
+# RESULT CACHE
+# ============================================================
+# Finished transcripts/summaries are stored by a content address built from
+# the audio's SHA-256 plus the model and summarizer settings, so re-uploading
+# the same recording (under any name) skips inference entirely.
+CACHE_FOLDER         = os.path.join(os.getcwd(), 'cache')
+RESULT_CACHE_MAX_MB  = int(os.getenv("RESULT_CACHE_MAX_MB", 500))
+HASH_CHUNK_SIZE      = 1024 * 1024
+
+
+def save_upload_hashed(file_storage, dest_path: str) -> str:
+    """Stream an uploaded file to disk, returning the SHA-256 of its contents."""
+    digest = hashlib.sha256()
+    with open(dest_path, 'wb') as out:
+        while True:
+            block = file_storage.stream.read(HASH_CHUNK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+            out.write(block)
+    return digest.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file already on disk."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded on-disk JSON cache; least recently used entries are evicted first."""
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = '.json'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix    = suffix
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._lock     = threading.Lock()
+        self._pinned   = collections.Counter()   # paths in use; never evicted
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(
+            os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory) if f.endswith(suffix)
+        )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)   # mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: dict) -> None:
+        self._store(key, lambda f: f.write(json.dumps(data).encode('utf-8')))
+
+    def _store(self, key: str, write) -> None:
+        """Write an entry atomically via `write(binary_file)` and evict if over budget."""
+        self._store_path(key, lambda tmp: _write_with(tmp, write))
+
+    def _store_path(self, key: str, write) -> None:
+        """Like _store, but `write(tmp_path)` creates the entry's file itself."""
+        path = self._path(key)
+        tmp  = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            write(tmp)
+            new_size = os.path.getsize(tmp)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Cache write error: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        except BaseException:
+            # e.g. a failed decode: drop the partial file and let the error through
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            self._size += new_size - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Caller holds self._lock.
+        entries = []
+        for f in os.listdir(self.directory):
+            if f.endswith(self.suffix):
+                p = os.path.join(self.directory, f)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if self._size <= self.max_bytes:
+                break
+            if self._pinned[p]:
+                continue
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+                'size_mb': round(self._size / (1024 * 1024), 2),
+                'max_mb': round(self.max_bytes / (1024 * 1024), 2),
+            }
+
+
+def _write_with(path: str, write) -> None:
+    with open(path, 'wb') as f:
+        write(f)
+
+
+result_cache = ResultCache(os.path.join(CACHE_FOLDER, 'results'), RESULT_CACHE_MAX_MB * 1024 * 1024)
+
+
+def result_cache_key(audio_hash: str, model_name: str) -> str:
+    # Summarizer settings are part of the key so changing them invalidates old results.
+    return ResultCache.make_key(audio_hash, model_name, BART_MODEL_NAME, SUMM_CHUNK_TOKENS, SUMM_MAX_LEVELS)
+
+
+# Decoded audio (16 kHz mono float32, what Whisper consumes) is kept per audio
+# hash as .npy, so re-transcribing with another model, a retry or a parallel
+# window reads memory-mapped slices instead of running ffmpeg again.
+PCM_CACHE_MAX_MB  = int(os.getenv("PCM_CACHE_MAX_MB", 2048))
+PCM_SAMPLE_RATE   = 16000     # whisper.audio.SAMPLE_RATE
+PCM_CHUNK_SAMPLES = 1 << 20   # samples converted to float32 at a time
+
+
+def decode_audio(file_path: str, out_path: str) -> int:
+    """
+    Decode to 16 kHz mono float32 like whisper.load_audio, without importing
+    torch, into the .npy file `out_path`. Returns the number of samples.
+
+    ffmpeg writes s16 straight to a scratch file, which is converted chunk by
+    chunk into an open_memmap, so memory use does not grow with the length
+    of the recording.
+    """
+    import numpy as np
+    raw_path = out_path + '.s16'
+    try:
+        with open(raw_path, 'wb') as raw:
+            proc = subprocess.run(
+                ["ffmpeg", "-nostdin", "-threads", "0", "-i", file_path,
+                 "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(PCM_SAMPLE_RATE), "-"],
+                stdout=raw, stderr=subprocess.PIPE
+            )
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=proc.stderr)
+        n   = os.path.getsize(raw_path) // 2
+        out = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.float32, shape=(n,))
+        if n:
+            pcm = np.memmap(raw_path, dtype=np.int16, mode='r', shape=(n,))
+            for i in range(0, n, PCM_CHUNK_SAMPLES):
+                out[i:i + PCM_CHUNK_SAMPLES] = pcm[i:i + PCM_CHUNK_SAMPLES] / np.float32(32768.0)
+            del pcm
+        out.flush()
+        del out
+        return n
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(raw_path)
+
+
+class PcmCache(ResultCache):
+    """Size-bounded cache of decoded audio, read through np.load(mmap_mode='r')."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        super().__init__(directory, max_bytes, suffix='.npy')
+        self._decoding = {}   # audio_hash -> lock, so one decode per file at a time
+
+    def ensure(self, audio_hash: str, file_path: str) -> str:
+        """
+        Path of the decoded samples for `audio_hash`, decoding `file_path` on a miss.
+
+        The path comes back pinned against eviction; release it with _unpin()
+        (open() does both).
+        """
+        path = self._path(audio_hash)
+        with self._lock:
+            lock = self._decoding.setdefault(audio_hash, threading.Lock())
+            self._pinned[path] += 1   # before the existence check, so a hit can't be evicted under us
+        try:
+            with lock:
+                try:
+                    os.utime(path)   # mark as recently used
+                    with self._lock:
+                        self.hits += 1
+                    return path
+                except OSError:
+                    pass
+                with self._lock:
+                    self.misses += 1
+                self._store_path(audio_hash, lambda tmp: decode_audio(file_path, tmp))
+                if not os.path.exists(path):
+                    raise OSError(f"Could not cache decoded audio for {file_path}")
+                return path
+        except BaseException:
+            self._unpin(path)
+            raise
+        finally:
+            with self._lock:
+                self._decoding.pop(audio_hash, None)
+
+    def _unpin(self, path):
+        with self._lock:
+            self._pinned[path] -= 1
+            if self._pinned[path] <= 0:
+                del self._pinned[path]
+
+    @contextlib.contextmanager
+    def open(self, audio_hash: str, file_path: str):
+        """Memory-mapped samples, protected from eviction while the block runs."""
+        import numpy as np
+        path = self.ensure(audio_hash, file_path)
+        try:
+            yield path, np.load(path, mmap_mode='r')
+        finally:
+            self._unpin(path)
+
+
+pcm_cache = PcmCache(os.path.join(CACHE_FOLDER, 'pcm'), PCM_CACHE_MAX_MB * 1024 * 1024)
 
 # ============================================================
 # USER CLASS
@@ -185,18 +1382,13 @@ def validate_password(password):
         return False, "Password must contain at least one special character (e.g. @, #, $, !)."
     return True, ""
 
-def normalise_phone(phone: str) -> str:
-    digits = re.sub(r'[\s\-\(\)]', '', phone)
-    return digits
-
 def find_user(identifier: str):
-    if identifier in users_db:
-        return identifier, users_db[identifier]
-    norm = normalise_phone(identifier)
-    for email_key, record in users_db.items():
-        stored_phone = normalise_phone(record.get("phone", ""))
-        if stored_phone and stored_phone == norm:
-            return email_key, record
+    record = user_store.get(identifier)
+    if record:
+        return identifier, record
+    record = user_store.find_by_phone(identifier)
+    if record:
+        return record['email'], record
     return None, None
 
 def token_required(f):
@@ -211,7 +1403,7 @@ def token_required(f):
             return jsonify({"detail": "Token is missing!"}), 401
         try:
             data = jwt.decode(token, app.secret_key, algorithms=[ALGORITHM])
-            current_user = users_db.get(data["sub"])
+            current_user = user_store.get(data["sub"])
             if not current_user:
                 return jsonify({"detail": "User not found!"}), 401
         except Exception as e:
@@ -219,6 +1411,17 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+def admin_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if ADMIN_TOKEN:
+            if not secrets.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+                return jsonify({"detail": "Admin token is missing or invalid!"}), 401
+        elif request.remote_addr not in ("127.0.0.1", "::1"):
+            return jsonify({"detail": "Admin routes are only available locally."}), 403
+        return f(*args, **kwargs)
+    return decorated
+
 # ============================================================
 # EMAIL SENDING FUNCTIONS
 # ============================================================
@@ -318,19 +1521,15 @@ def register_request_otp():
         return jsonify({"detail": "Missing email address"}), 400
 
     email = data['email'].strip().lower()
-    if email in users_db:
+    if user_store.exists(email):
         return jsonify({"detail": "This email is already registered. Please login instead."}), 400
 
     otp = str(random.randint(100000, 999999))
-    otp_store[email] = {
-        "otp": otp,
-        "expires": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=10),
-        "verified": False
-    }
+    otp_store.set(email, {"otp": otp, "verified": False}, ttl_sec=10 * 60)
 
     sent = send_otp_email(email, otp)
     if not sent:
-        otp_store.pop(email, None)
+        otp_store.pop(email)
         return jsonify({"detail": "Could not send OTP. Please check SMTP configuration."}), 500
 
     return jsonify({"message": "OTP sent to your email. Please verify to continue registration."})
@@ -350,34 +1549,34 @@ def register():
 
     otp_data = otp_store.get(email)
     if not otp_data:
-        return jsonify({"detail": "No OTP found. Please request a new one."}), 400
-
-    if datetime.datetime.now(datetime.timezone.utc) > otp_data['expires']:
-        otp_store.pop(email, None)
-        return jsonify({"detail": "OTP has expired. Please request a new one."}), 400
+        return jsonify({"detail": "No OTP found or it has expired. Please request a new one."}), 400
 
     if otp_data['otp'] != otp:
+        if otp_store.incr_attempts(email) >= OTP_MAX_ATTEMPTS:
+            otp_store.pop(email)
+            return jsonify({"detail": "Too many incorrect attempts. Please request a new OTP."}), 429
         return jsonify({"detail": "Incorrect OTP. Please try again."}), 401
 
     is_valid, err_msg = validate_password(password)
     if not is_valid:
         return jsonify({"detail": err_msg}), 400
 
-    if email in users_db:
+    if user_store.exists(email):
         return jsonify({"detail": "User already exists with this email."}), 400
 
-    if phone:
-        for record in users_db.values():
-            if normalise_phone(record.get("phone", "")) == phone:
-                return jsonify({"detail": "Phone number already registered."}), 400
+    if phone and user_store.find_by_phone(phone):
+        return jsonify({"detail": "Phone number already registered."}), 400
 
     new_user_obj = User(name, email, phone)
     user_details = new_user_obj.register()
     user_details['password_hash'] = hash_password(password)
 
-    users_db[email] = user_details
-    save_users()
-    otp_store.pop(email, None)
+    try:
+        user_store.insert(user_details)
+    except sqlite3.IntegrityError:
+        # Lost a race with a concurrent registration for the same email/phone.
+        return jsonify({"detail": "User already exists with this email or phone."}), 400
+    otp_store.pop(email)
 
     return jsonify({
         "message": "Account created successfully! You can now log in.",
@@ -423,18 +1622,15 @@ def request_otp():
         return jsonify({"detail": "Missing email address"}), 400
 
     email = data['email'].strip().lower()
-    if email not in users_db:
+    if not user_store.exists(email):
         return jsonify({"message": "If that email is registered, an OTP has been sent."})
 
     otp = str(random.randint(100000, 999999))
-    otp_store[email] = {
-        "otp": otp,
-        "expires": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=5)
-    }
+    otp_store.set(email, {"otp": otp}, ttl_sec=5 * 60)
 
     sent = send_otp_email(email, otp)
     if not sent:
-        otp_store.pop(email, None)
+        otp_store.pop(email)
         return jsonify({"detail": "Could not send OTP. Please check SMTP configuration."}), 500
 
     return jsonify({"message": "If that email is registered, an OTP has been sent."})
@@ -453,18 +1649,17 @@ def verify_otp():
     if not otp_data:
         return jsonify({"detail": "Invalid or expired OTP."}), 400
 
-    if datetime.datetime.now(datetime.timezone.utc) > otp_data['expires']:
-        otp_store.pop(email, None)
-        return jsonify({"detail": "OTP has expired. Please request a new one."}), 400
-
     if otp_data['otp'] != otp:
+        if otp_store.incr_attempts(email) >= OTP_MAX_ATTEMPTS:
+            otp_store.pop(email)
+            return jsonify({"detail": "Too many incorrect attempts. Please request a new OTP."}), 429
         return jsonify({"detail": "Incorrect OTP."}), 401
 
-    otp_store.pop(email, None)
-    if email not in users_db:
+    otp_store.pop(email)
+    user_record = user_store.get(email)
+    if not user_record:
         return jsonify({"detail": "User not found."}), 404
 
-    user_record = users_db[email]
     return jsonify({
         "access_token": create_token(email),
         "user_id":      user_record['user_id'],
@@ -534,14 +1729,17 @@ def google_callback():
         return "Could not retrieve email from Google", 400
 
     email = email.lower()
-    if email not in users_db:
+    user_record = user_store.get(email)
+    if not user_record:
         new_user_obj = User(name, email, phone="")
         user_details = new_user_obj.register()
         user_details['password_hash'] = ""
-        users_db[email] = user_details
-        save_users()
+        try:
+            user_store.insert(user_details)
+        except sqlite3.IntegrityError:
+            pass   # created concurrently by another request
+        user_record = user_store.get(email)
 
-    user_record = users_db[email]
     token = create_token(email)
     return redirect(f"/?google_login=success&token={token}&name={user_record['name']}&user_id={user_record['user_id']}")
 
@@ -553,18 +1751,15 @@ def forgot_password():
         return jsonify({"detail": "Missing email address"}), 400
 
     email = data['email'].strip().lower()
-    if email not in users_db:
+    if not user_store.exists(email):
         return jsonify({"message": "If that email is registered, a reset link has been sent."})
 
     token = secrets.token_urlsafe(48)
-    reset_tokens[token] = {
-        "email":   email,
-        "expires": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=30)
-    }
+    reset_tokens.set(token, {"email": email}, ttl_sec=30 * 60)
 
     sent = send_reset_email(email, token)
     if not sent:
-        reset_tokens.pop(token, None)
+        reset_tokens.pop(token)
         return jsonify({"detail": "Could not send reset email. Please check SMTP configuration."}), 500
 
     return jsonify({"message": "If that email is registered, a reset link has been sent."})
@@ -587,23 +1782,18 @@ def reset_password():
 
     token_data = reset_tokens.get(token)
     if not token_data:
-        return jsonify({"detail": "Invalid or expired reset token."}), 400
-
-    if datetime.datetime.now(datetime.timezone.utc) > token_data['expires']:
-        reset_tokens.pop(token, None)
-        return jsonify({"detail": "Reset token has expired. Please request a new one."}), 400
+        return jsonify({"detail": "Invalid or expired reset token. Please request a new one."}), 400
 
     is_valid, err_msg = validate_password(new_password)
     if not is_valid:
         return jsonify({"detail": err_msg}), 400
 
     email = token_data['email']
-    if email not in users_db:
+    if not user_store.exists(email):
         return jsonify({"detail": "User not found."}), 404
 
-    users_db[email]['password_hash'] = hash_password(new_password)
-    save_users()
-    reset_tokens.pop(token, None)
+    user_store.update_password(email, hash_password(new_password))
+    reset_tokens.pop(token)
 
     return jsonify({"message": "Password reset successfully! You can now log in."})
 
@@ -619,101 +1809,1235 @@ def format_timestamp(seconds):
     td = time.gmtime(seconds)
     return time.strftime("%H:%M:%S", td)
 
-def summarize_chunk(text_chunk):
+# Summaries are generated in padded batches. Chunks from every running job go
+# through one shared batcher, so concurrent jobs fill the same generate() call.
+SUMM_MAX_BATCH     = max(1, int(os.getenv("SUMM_MAX_BATCH", 8)))
+SUMM_BATCH_WAIT_MS = int(os.getenv("SUMM_BATCH_WAIT_MS", 50))
+
+
+def _generate_summaries(texts):
+    """Run one padded BART generate() over a batch of texts. Falls back to the inputs on failure."""
+    summ_model, summ_tokenizer = get_summarizer()
     if not summ_model or not summ_tokenizer:
-        return text_chunk
+        return list(texts)
     try:
-        input_ids = summ_tokenizer.encode(text_chunk, return_tensors="pt", max_length=1024, truncation=True)
-        summary_ids = summ_model.generate(
-            input_ids, max_length=150, min_length=40, num_beams=4,
-            length_penalty=2.0, early_stopping=True, no_repeat_ngram_size=3
+        import torch
+        inputs = summ_tokenizer(
+            list(texts), return_tensors="pt", max_length=1024, truncation=True, padding=True
         )
-        return summ_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        with torch.no_grad():
+            summary_ids = summ_model.generate(
+                inputs['input_ids'], attention_mask=inputs['attention_mask'],
+                max_length=150, min_length=40, num_beams=4,
+                length_penalty=2.0, early_stopping=True, no_repeat_ngram_size=3
+            )
+        return summ_tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
     except Exception as e:
-        print(f"Chunk summarization error: {e}")
-        return text_chunk
+        print(f"Batch summarization error ({len(texts)} chunks): {e}")
+        return list(texts)
+
+
+class SummaryBatcher:
+    """
+    Collects summarization requests from all jobs and runs them in batches.
+
+    A batch is dispatched when it reaches `max_batch` chunks or when the oldest
+    request has waited `wait_ms`, whichever comes first.
+    """
+
+    def __init__(self, max_batch: int, wait_ms: int):
+        self.max_batch = max_batch
+        self.wait_sec  = wait_ms / 1000.0
+        self._pending  = collections.deque()     # (text, Future)
+        self._cond     = threading.Condition()
+        self._thread   = None
+
+    def summarize(self, texts):
+        """Summarize a list of texts, blocking until all are done. Order is preserved."""
+        if not texts:
+            return []
+        futures = [concurrent.futures.Future() for _ in texts]
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="summary-batcher", daemon=True)
+                self._thread.start()
+            self._pending.extend(zip(texts, futures))
+            self._cond.notify()
+        return [f.result() for f in futures]
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.time() + self.wait_sec
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for text, _ in batch]
+            try:
+                if use_process_backend():
+                    summaries = inference_pool.summarize(texts)
+                else:
+                    summaries = _generate_summaries(texts)
+                if len(summaries) != len(batch):
+                    raise RuntimeError(f"Summarizer returned {len(summaries)} results for {len(batch)} chunks")
+            except Exception as e:
+                # Fail every waiting job instead of passing raw chunks off as summaries.
+                print(f"Summary batcher error: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), summary in zip(batch, summaries):
+                future.set_result(summary)
+
+
+summary_batcher = SummaryBatcher(SUMM_MAX_BATCH, SUMM_BATCH_WAIT_MS)
+
+
+def summarize_chunk(text_chunk):
+    return summary_batcher.summarize([text_chunk])[0]
+
+
+# Chunks are measured in BART tokens and cut on sentence boundaries so nothing
+# is truncated away by the 1024-token encoder window.
+SUMM_CHUNK_TOKENS = int(os.getenv("SUMM_CHUNK_TOKENS", 1000))
+SUMM_MAX_LEVELS   = int(os.getenv("SUMM_MAX_LEVELS", 3))
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def _token_counter():
+    """Return a function counting BART tokens, or a word-based estimate without the tokenizer."""
+    # Tokenizer only: with the process backend the model lives in the workers.
+    summ_tokenizer = get_summary_tokenizer()
+    if summ_tokenizer:
+        return lambda text: len(summ_tokenizer.encode(text, add_special_tokens=False))
+    return lambda text: int(len(text.split()) * 1.3) + 1
+
+
+def chunk_by_tokens(text: str, max_tokens: int = SUMM_CHUNK_TOKENS, count_tokens=None) -> list:
+    """Split text into chunks of at most max_tokens, breaking on sentence boundaries."""
+    count_tokens = count_tokens or _token_counter()
+    chunks, current, current_tokens = [], [], 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(" ".join(current))
+        current, current_tokens = [], 0
+
+    for sentence in _SENTENCE_SPLIT.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        n = count_tokens(sentence)
+        if n > max_tokens:
+            # A single run-on sentence: fall back to splitting it on words.
+            flush()
+            for word in sentence.split():
+                w = count_tokens(" " + word)
+                if current and current_tokens + w > max_tokens:
+                    flush()
+                current.append(word)
+                current_tokens += w
+            flush()
+            continue
+        if current and current_tokens + n > max_tokens:
+            flush()
+        current.append(sentence)
+        current_tokens += n
+    flush()
+    return chunks
+
+
+def _dedup_summaries(summaries) -> list:
+    """Drop empty and repeated summaries, ignoring case and surrounding whitespace; keeps the first wording."""
+    seen = {}
+    for s in summaries:
+        key = " ".join(s.split()).lower() if s else ""
+        if key and key not in seen:
+            seen[key] = s.strip()
+    return list(seen.values())
+
+
+def summarize_text(full_text: str) -> str:
+    """
+    Map-reduce summarization of an arbitrarily long text.
 
-def run_transcription(file_path, filename):
-    print(f"Starting transcription for: {filename}")
+    Map: summarize every token-bounded chunk in batches. Reduce: while the
+    joined chunk summaries still exceed one window, chunk and summarize them
+    again, up to SUMM_MAX_LEVELS levels.
+    """
+    count_tokens = _token_counter()
+    chunks = [c for c in chunk_by_tokens(full_text, count_tokens=count_tokens) if len(c.strip()) > 30]
+    if not chunks:
+        return summarize_chunk(full_text)
+
+    summaries = summary_batcher.summarize(chunks)
+    for _ in range(SUMM_MAX_LEVELS):
+        # Drop repeats (BART tends to repeat itself on looping audio).
+        summaries = _dedup_summaries(summaries)
+        joined = " ".join(summaries)
+        if len(summaries) <= 1 or count_tokens(joined) <= SUMM_CHUNK_TOKENS:
+            return joined
+        summaries = summary_batcher.summarize(chunk_by_tokens(joined, count_tokens=count_tokens))
+    return " ".join(_dedup_summaries(summaries))
+
+# Audio is transcribed window by window so each segment can be published as
+# soon as it is decoded. The last (possibly cut-off) segment of a window is
+# re-decoded at the start of the next one, mirroring Whisper's own seek logic.
+STREAM_WINDOW_SEC = int(os.getenv("STREAM_WINDOW_SEC", 30))
+
+
+def transcribe_incremental(model, audio, on_segment=None, on_progress=None, language=None) -> dict:
+    """
+    Transcribe `audio` (a file path or 16 kHz float32 samples, possibly a
+    read-only memmap), calling on_segment(segment) for each segment as it is
+    decoded.
+
+    Returns a dict shaped like model.transcribe(): {'text', 'segments', 'language'},
+    with segment times relative to the start of `audio`.
+    """
+    import numpy as np
+    import whisper
+    if isinstance(audio, str):
+        audio = whisper.load_audio(audio)
+    sample_rate = whisper.audio.SAMPLE_RATE
+    total       = len(audio)
+    window      = STREAM_WINDOW_SEC * sample_rate
+
+    segments, offset = [], 0
+    while offset < total:
+        end   = min(offset + window, total)
+        chunk = np.array(audio[offset:end], dtype=np.float32)   # only this window is read into RAM
+        prompt = " ".join(s['text'].strip() for s in segments[-5:])[-200:] or None
+        result = model.transcribe(
+            chunk, fp16=False, verbose=None, language=language, initial_prompt=prompt
+        )
+        language = language or result.get('language')
+        window_segments = result.get('segments', [])
+
+        # Unless this is the final window, hold back the last segment: it may
+        # be cut mid-word, so the next window starts where it began.
+        next_offset = end
+        if end < total and len(window_segments) > 1:
+            next_offset = offset + int(window_segments[-1]['start'] * sample_rate)
+            window_segments = window_segments[:-1]
+
+        base = offset / sample_rate
+        for s in window_segments:
+            text = s['text'].strip()
+            if not text:
+                continue
+            seg = {'start': base + s['start'], 'end': base + s['end'], 'text': text}
+            segments.append(seg)
+            if on_segment:
+                on_segment(seg)
+
+        offset = max(next_offset, offset + sample_rate)   # always advance at least 1s
+        if on_progress:
+            on_progress(min(offset, total) / total)
+
+    return {
+        'text':     " ".join(s['text'] for s in segments),
+        'segments': segments,
+        'language': language,
+    }
+
+
+# ============================================================
+# INFERENCE BACKEND
+# ============================================================
+# With INFERENCE_BACKEND=process, Whisper and BART run in long-lived worker
+# processes instead of Flask's threads, so heavy torch work never competes
+# with request handling and a stuck model call cannot stall the server.
+# Each worker keeps its own loaded models and pinned torch thread counts.
+#
+# Protocol: the parent puts (task_id, kind, payload) on a worker's task queue;
+# the worker answers on the shared result queue with ('started' | 'segment' |
+# 'progress' | 'done' | 'error', task_id, data).
+INFERENCE_PROCESSES    = max(1, int(os.getenv("INFERENCE_PROCESSES", TRANSCRIBE_WORKERS)))
+TORCH_THREADS          = int(os.getenv("TORCH_THREADS", 0)) or max(1, (os.cpu_count() or 1) // INFERENCE_PROCESSES)
+TORCH_INTEROP_THREADS  = max(1, int(os.getenv("TORCH_INTEROP_THREADS", 1)))
+INFERENCE_TASK_TIMEOUT = int(os.getenv("INFERENCE_TASK_TIMEOUT", 3600))
+
+
+def _inference_worker_main(index, task_q, result_q, threads, interop_threads):
+    """Entry point of an inference worker process."""
     try:
-        processing_jobs[filename] = {'status': 'processing', 'progress': 10}
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(interop_threads)
+    except Exception as e:
+        print(f"Inference worker {index}: could not pin torch threads: {e}")
+    print(f"Inference worker {index} started (pid={os.getpid()}, torch threads={threads}/{interop_threads}).")
+    if PRELOAD_MODELS:
+        warmup_models()
+
+    while True:
+        task = task_q.get()
+        if task is None:
+            return
+        task_id, kind, payload = task
+        result_q.put(('started', task_id, index))
+        try:
+            if kind == 'transcribe':
+                model_name, audio_path = payload
+                if audio_path.endswith('.npy'):
+                    import numpy as np
+                    audio_path = np.load(audio_path, mmap_mode='r')
+                with whisper_registry.acquire(model_name, exclusive=True) as model:
+                    result = transcribe_incremental(
+                        model, audio_path,
+                        on_segment=lambda seg: result_q.put(('segment', task_id, seg)),
+                        on_progress=lambda frac: result_q.put(('progress', task_id, frac)),
+                    )
+            elif kind == 'transcribe_window':
+                model_name, pcm_path, start, end, language = payload
+                import numpy as np
+                window = np.load(pcm_path, mmap_mode='r')[start:end]
+                with whisper_registry.acquire(model_name, exclusive=True) as model:
+                    result = transcribe_incremental(model, window, language=language)
+            elif kind == 'summarize':
+                result = _generate_summaries(payload)
+            elif kind == 'warmup':
+                result = warmup_models(payload)
+            else:
+                raise ValueError(f"Unknown inference task: {kind}")
+            result_q.put(('done', task_id, result))
+        except Exception as e:
+            result_q.put(('error', task_id, str(e)))
+
+
+class InferencePool:
+    """Parent-side handle on the inference worker processes."""
+
+    def __init__(self, size: int, threads: int, interop_threads: int, task_timeout: int):
+        self.size            = size
+        self.threads         = threads
+        self.interop_threads = interop_threads
+        self.task_timeout    = task_timeout
+        self._ctx            = multiprocessing.get_context('spawn')
+        self._lock           = threading.Lock()
+        self._workers        = [None] * size    # (process, task_queue)
+        self._load           = [0] * size       # tasks assigned per worker
+        self._tasks          = {}               # task_id -> {'worker', 'future', 'on_event', 'started', 'last_event'}
+        self._result_q       = None
+        self._restarts       = 0
+
+    @property
+    def started(self) -> bool:
+        return self._result_q is not None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._result_q is not None:
+                return
+            self._result_q = self._ctx.Queue()
+            for i in range(self.size):
+                self._spawn(i)
+        threading.Thread(target=self._dispatch_loop, name="inference-dispatch", daemon=True).start()
+
+    def _spawn(self, index):
+        # Caller holds self._lock.
+        task_q = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_inference_worker_main,
+            args=(index, task_q, self._result_q, self.threads, self.interop_threads),
+            name=f"inference-worker-{index}", daemon=True
+        )
+        proc.start()
+        self._workers[index] = (proc, task_q)
+        self._load[index] = 0
+
+    def submit(self, kind, payload, on_event=None, worker=None) -> concurrent.futures.Future:
+        """Send a task to the least busy worker (or a specific one). Returns a Future."""
+        self._ensure_started()
+        future  = concurrent.futures.Future()
+        task_id = uuid.uuid4().hex
+        with self._lock:
+            index = worker if worker is not None else min(range(self.size), key=lambda i: self._load[i])
+            self._load[index] += 1
+            self._tasks[task_id] = {
+                'worker': index, 'future': future, 'on_event': on_event, 'started': None, 'last_event': None
+            }
+            self._workers[index][1].put((task_id, kind, payload))
+        return future
+
+    def transcribe(self, model_name, file_path, on_segment=None, on_progress=None) -> dict:
+        def on_event(kind, data):
+            if kind == 'segment' and on_segment:
+                on_segment(data)
+            elif kind == 'progress' and on_progress:
+                on_progress(data)
+        return self.submit('transcribe', (model_name, file_path), on_event).result()
+
+    def summarize(self, texts) -> list:
+        return self.submit('summarize', list(texts)).result()
+
+    def warmup(self, names=None) -> list:
+        futures = [self.submit('warmup', names, worker=i) for i in range(self.size)]
+        return [f.result() for f in futures]
+
+    def _finish(self, task_id):
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task:
+                self._load[task['worker']] = max(0, self._load[task['worker']] - 1)
+        return task
+
+    def _dispatch_loop(self):
+        last_check = time.time()
+        while True:
+            # Health checks run on a timer: a busy result queue (other workers
+            # streaming segments) must not hide a dead or stuck worker.
+            if time.time() - last_check >= 1:
+                self._check_workers()
+                last_check = time.time()
+            try:
+                kind, task_id, data = self._result_q.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            if kind in ('done', 'error'):
+                task = self._finish(task_id)
+                if task:
+                    if kind == 'done':
+                        task['future'].set_result(data)
+                    else:
+                        task['future'].set_exception(RuntimeError(data))
+                continue
+
+            with self._lock:
+                task = self._tasks.get(task_id)
+                if task:
+                    task['last_event'] = time.time()
+                    if kind == 'started':
+                        task['started'] = task['last_event']
+            if task and task['on_event'] and kind in ('segment', 'progress'):
+                try:
+                    task['on_event'](kind, data)
+                except Exception as e:
+                    print(f"Inference event handler error: {e}")
+
+    def _check_workers(self):
+        # Restart workers that died or whose task has sent nothing (started,
+        # segment or progress) for longer than the task timeout, failing
+        # whatever they were running. A long transcription that keeps
+        # streaming segments is never considered stuck.
+        now = time.time()
+        with self._lock:
+            for index, (proc, _) in enumerate(self._workers):
+                running = [
+                    tid for tid, t in self._tasks.items() if t['worker'] == index
+                ]
+                stuck = any(
+                    self._tasks[tid]['last_event'] and now - self._tasks[tid]['last_event'] > self.task_timeout
+                    for tid in running
+                )
+                if proc.is_alive() and not stuck:
+                    continue
+                reason = 'timed out' if stuck else f'exited with code {proc.exitcode}'
+                print(f"Inference worker {index} {reason}; restarting.")
+                if proc.is_alive():
+                    proc.terminate()
+                for tid in running:
+                    task = self._tasks.pop(tid)
+                    task['future'].set_exception(RuntimeError(f"Inference worker {reason}"))
+                self._restarts += 1
+                self._spawn(index)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                'started':  self.started,
+                'size':     self.size,
+                'alive':    sum(1 for w in self._workers if w and w[0].is_alive()),
+                'busy':     list(self._load),
+                'restarts': self._restarts,
+                'torch_threads': self.threads,
+                'torch_interop_threads': self.interop_threads,
+            }
+
+
+inference_pool = InferencePool(INFERENCE_PROCESSES, TORCH_THREADS, TORCH_INTEROP_THREADS, INFERENCE_TASK_TIMEOUT)
+if PRELOAD_MODELS and use_process_backend():
+    inference_pool._ensure_started()
+
+
+# Long recordings are cut into overlapping windows transcribed in parallel on
+# the inference worker processes, then stitched back into one timeline. This
+# needs the process backend: Whisper's decoder installs hooks on the shared
+# model, so windows cannot safely run concurrently on one in-process model.
+LONG_AUDIO_THRESHOLD_SEC = int(os.getenv("LONG_AUDIO_THRESHOLD_SEC", 900))
+LONG_AUDIO_WINDOW_SEC    = int(os.getenv("LONG_AUDIO_WINDOW_SEC", 300))
+LONG_AUDIO_OVERLAP_SEC   = int(os.getenv("LONG_AUDIO_OVERLAP_SEC", 5))
+
+
+def plan_windows(total_samples: int, sample_rate: int) -> list:
+    """(start, end) sample ranges of overlapping windows covering the audio."""
+    window  = LONG_AUDIO_WINDOW_SEC * sample_rate
+    step    = max(sample_rate, window - LONG_AUDIO_OVERLAP_SEC * sample_rate)
+    windows, start = [], 0
+    while True:
+        end = min(start + window, total_samples)
+        windows.append((start, end))
+        if end >= total_samples:
+            return windows
+        start += step
+
+
+def stitch_windows(windows, results, sample_rate) -> list:
+    """
+    Merge per-window segments into one timeline.
+
+    Window-relative times are shifted by the window start. In each overlap,
+    segments starting before its midpoint come from the earlier window and the
+    rest from the later one; a repeated boundary line is dropped.
+    """
+    merged = []
+    for i, ((start, end), result) in enumerate(zip(windows, results)):
+        base = start / sample_rate
+        lo = hi = None
+        if i > 0:
+            prev_end = windows[i - 1][1] / sample_rate
+            lo = (base + prev_end) / 2
+        if i + 1 < len(windows):
+            next_start = windows[i + 1][0] / sample_rate
+            hi = (next_start + end / sample_rate) / 2
+        for s in result['segments']:
+            seg = {'start': base + s['start'], 'end': base + s['end'], 'text': s['text']}
+            if lo is not None and seg['start'] < lo:
+                continue
+            if hi is not None and seg['start'] >= hi:
+                continue
+            if merged and seg['text'].strip().lower() == merged[-1]['text'].strip().lower():
+                continue
+            merged.append(seg)
+    return merged
+
+
+def transcribe_parallel(model_name, pcm_path, total_samples, on_segment=None, on_progress=None) -> dict:
+    """Transcribe decoded audio (a .npy the workers memory-map) as overlapping windows across the workers."""
+    sample_rate = PCM_SAMPLE_RATE
+    windows     = plan_windows(total_samples, sample_rate)
+
+    # Detect the language once on the first window so every window agrees.
+    first = inference_pool.submit(
+        'transcribe_window', (model_name, pcm_path, *windows[0], None)
+    ).result()
+    language = first.get('language')
+    futures = [
+        inference_pool.submit('transcribe_window', (model_name, pcm_path, start, end, language))
+        for start, end in windows[1:]
+    ]
+    results = [first] + [None] * len(futures)
+
+    # Publish segments in order as soon as every earlier window is done.
+    published, emitted = 1, 0
+    pending = {f: i + 1 for i, f in enumerate(futures)}
+    done_count = 1
+    while True:
+        ready = stitch_windows(windows[:published], results[:published], sample_rate)
+        if published < len(windows):
+            # The tail may still change once the next window arrives.
+            hi = (windows[published][0] + windows[published - 1][1]) / 2 / sample_rate
+            ready = [s for s in ready if s['start'] < hi]
+        for seg in ready[emitted:]:
+            if on_segment:
+                on_segment(seg)
+        emitted = max(emitted, len(ready))
+        if on_progress:
+            on_progress(done_count / len(windows))
+        if not pending:
+            break
+        finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for f in finished:
+            results[pending.pop(f)] = f.result()
+            done_count += 1
+        while published < len(windows) and results[published] is not None:
+            published += 1
+
+    segments = stitch_windows(windows, results, sample_rate)
+    return {
+        'text':     " ".join(s['text'].strip() for s in segments),
+        'segments': segments,
+        'language': language,
+    }
+
+
+def run_whisper(model_name, file_path, on_segment=None, on_progress=None, audio_hash=None) -> dict:
+    """Transcribe on the configured inference backend, reading decoded audio from the PCM cache."""
+    if audio_hash is None:
+        audio_hash = hash_file(file_path)
+    with pcm_cache.open(audio_hash, file_path) as (pcm_path, audio):
+        if use_process_backend():
+            duration = len(audio) / PCM_SAMPLE_RATE
+            if inference_pool.size > 1 and duration >= LONG_AUDIO_THRESHOLD_SEC:
+                print(f"Long audio ({duration:.0f}s): transcribing in parallel windows.")
+                return transcribe_parallel(model_name, pcm_path, len(audio), on_segment, on_progress)
+            return inference_pool.transcribe(model_name, pcm_path, on_segment, on_progress)
+        with whisper_registry.acquire(model_name, exclusive=True) as model:
+            return transcribe_incremental(model, audio, on_segment, on_progress)
+
+
+def _format_segment(index, seg) -> dict:
+    return {
+        'index': index,
+        'start': round(seg['start'], 2),
+        'end':   round(seg['end'], 2),
+        'text':  seg['text'].strip(),
+        'line':  f"[{format_timestamp(seg['start'])} - {format_timestamp(seg['end'])}] {seg['text'].strip()}",
+    }
+
+
+# ============================================================
+# SEGMENT STORAGE
+# ============================================================
+# Decoded segments are kept per upload in one columnar file, <name>.segments:
+#   header  – magic + segment count n
+#   starts  – float64[n], ends – float64[n]
+#   offsets – int64[n + 1] into the text blob
+#   text    – UTF-8 segment texts back to back
+# Readers memory-map it, so exports and lookups only touch the pages they use.
+# <name>.txt is rendered from it on first use.
+SEGMENTS_SUFFIX = ".segments"
+SEGMENTS_MAGIC  = b"TFSEG001"
+_SEG_HEADER     = struct.Struct("<8sQ")
+
+
+def _segments_path(filename):
+    return os.path.join(app.config['UPLOAD_FOLDER'], filename + SEGMENTS_SUFFIX)
+
+
+def write_segments(path, segments) -> int:
+    """Write a list of segments (dicts with start/end/text) to a columnar file. Returns the count."""
+    import numpy as np
+    texts   = [seg['text'].strip().encode('utf-8') for seg in segments]
+    starts  = np.array([seg['start'] for seg in segments], dtype='<f8')
+    ends    = np.array([seg['end'] for seg in segments], dtype='<f8')
+    offsets = np.zeros(len(texts) + 1, dtype='<i8')
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_SEG_HEADER.pack(SEGMENTS_MAGIC, len(texts)))
+        f.write(starts.tobytes())
+        f.write(ends.tobytes())
+        f.write(offsets.tobytes())
+        for t in texts:
+            f.write(t)
+    os.replace(tmp, path)
+    return len(texts)
+
+
+class SegmentFile:
+    """Read-only, memory-mapped view of a segments file."""
+
+    def __init__(self, path: str):
+        import numpy as np
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, n = _SEG_HEADER.unpack(bytes(raw[:_SEG_HEADER.size]))
+        if magic != SEGMENTS_MAGIC:
+            raise ValueError(f"Not a segments file: {path}")
+        pos = _SEG_HEADER.size
+        self.starts  = raw[pos:pos + 8 * n].view('<f8')
+        pos += 8 * n
+        self.ends    = raw[pos:pos + 8 * n].view('<f8')
+        pos += 8 * n
+        self.offsets = raw[pos:pos + 8 * (n + 1)].view('<i8')
+        pos += 8 * (n + 1)
+        self._text   = raw[pos:]
+        self._count  = n
+
+    def __len__(self):
+        return self._count
+
+    def text(self, i: int) -> str:
+        return bytes(self._text[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def segment(self, i: int) -> dict:
+        return {'index': i, 'start': float(self.starts[i]), 'end': float(self.ends[i]), 'text': self.text(i)}
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self.segment(i)
+
+    def window(self, start: float, end: float):
+        """Index range [first, stop) of the segments overlapping [start, end), by binary search on starts."""
+        import numpy as np
+        first = int(np.searchsorted(self.starts, start, side='right')) - 1
+        if first < 0 or self.ends[first] <= start:
+            first += 1
+        stop = int(np.searchsorted(self.starts, end, side='left'))
+        return first, max(first, stop)
+
+    @property
+    def duration(self) -> float:
+        return float(self.ends[-1]) if self._count else 0.0
+
+
+def open_segments(filename):
+    path = _segments_path(filename)
+    return SegmentFile(path) if os.path.exists(path) else None
+
+
+def iter_transcript_lines(segs: SegmentFile):
+    for i in range(len(segs)):
+        yield f"[{format_timestamp(segs.starts[i])} - {format_timestamp(segs.ends[i])}] {segs.text(i)}\n"
+
+
+def _subtitle_timestamp(seconds: float, sep: str) -> str:
+    ms = int(round(seconds * 1000))
+    h, ms = divmod(ms, 3600000)
+    m, ms = divmod(ms, 60000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{ms:03d}"
+
+
+def iter_srt(segs: SegmentFile, texts=None):
+    for i in range(len(segs)):
+        text = texts[i] if texts is not None else segs.text(i)
+        yield (f"{i + 1}\n{_subtitle_timestamp(segs.starts[i], ',')} --> "
+               f"{_subtitle_timestamp(segs.ends[i], ',')}\n{text}\n\n")
+
+
+def iter_vtt(segs: SegmentFile, texts=None):
+    yield "WEBVTT\n\n"
+    for i in range(len(segs)):
+        text = texts[i] if texts is not None else segs.text(i)
+        yield f"{_subtitle_timestamp(segs.starts[i], '.')} --> {_subtitle_timestamp(segs.ends[i], '.')}\n{text}\n\n"
+
+
+SUBTITLE_FORMATS = {
+    'srt': ('application/x-subrip', iter_srt),
+    'vtt': ('text/vtt', iter_vtt),
+}
+
+
+def transcript_text(filename):
+    """The formatted transcript of a finished job, or None. <name>.txt is rendered from segments once."""
+    transcript_path = os.path.join(app.config['UPLOAD_FOLDER'], filename + ".txt")
+    if os.path.exists(transcript_path):
+        with open(transcript_path, "r", encoding="utf-8") as f:
+            return f.read()
+    segs = open_segments(filename)
+    if segs is None:
+        return None
+    text = ''.join(iter_transcript_lines(segs))
+    tmp  = f"{transcript_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, transcript_path)
+    return text
+
+
+def load_results(filename):
+    """(transcript, summary) for a finished job, or None."""
+    transcript = transcript_text(filename)
+    if transcript is None:
+        return None
+    summary_path = os.path.join(app.config['UPLOAD_FOLDER'], filename + "_summary.txt")
+    summary = ""
+    if os.path.exists(summary_path):
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary = f.read()
+    return transcript, summary
+
+
+def _write_results(filename, summary, segments=None, transcript=None):
+    """Persist a job's segments (or, for old cache entries, its formatted transcript) and summary."""
+    transcript_path = os.path.join(app.config['UPLOAD_FOLDER'], filename + ".txt")
+    summary_path    = os.path.join(app.config['UPLOAD_FOLDER'], filename + "_summary.txt")
+
+    if segments is not None:
+        write_segments(_segments_path(filename), segments)
+        if os.path.exists(transcript_path):
+            os.remove(transcript_path)   # stale; re-rendered from the segments on demand
+    else:
+        with open(transcript_path, "w", encoding="utf-8") as f:
+            f.write(transcript)
+        if os.path.exists(_segments_path(filename)):
+            os.remove(_segments_path(filename))   # from an earlier upload under this name
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(summary)
+
+
+def run_transcription(file_path, filename, model_name=WHISPER_MODEL_NAME, audio_hash=None):
+    print(f"Starting transcription for: {filename} (model={model_name})")
+    try:
+        queued_at = (get_job(filename) or {}).get('queued_at')
+        set_job(filename, {
+            'status': 'processing', 'stage': 'transcribing', 'progress': 10, 'model': model_name,
+            'queued_at': queued_at, 'started_at': time.time(), 'segment_count': 0
+        })
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Audio file not found at {file_path}")
 
-        result = model.transcribe(file_path, verbose=True, fp16=False)
-        processing_jobs[filename]['progress'] = 60
+        segment_count = 0
+
+        def publish_segment(seg):
+            nonlocal segment_count
+            append_job_segment(filename, _format_segment(segment_count, seg))
+            segment_count += 1
+
+        def publish_progress(fraction):
+            update_job(filename, progress=10 + int(fraction * 50))
+
+        result = run_whisper(model_name, file_path, publish_segment, publish_progress, audio_hash)
+        update_job(filename, progress=60)
 
         full_text = result['text'].strip()
         segments  = result.get('segments', [])
-        formatted_transcript = ""
 
-        for s in segments:
-            start = format_timestamp(s['start'])
-            end   = format_timestamp(s['end'])
-            formatted_transcript += f"[{start} - {end}] {s['text'].strip()}\n"
-
-        processing_jobs[filename]['progress'] = 75
+        update_job(filename, stage='summarizing', progress=75)
         summary_text = ""
 
         if len(full_text) > 50:
-            chunk_size = 3000
-            chunks = [full_text[i:i+chunk_size] for i in range(0, len(full_text), chunk_size)]
-            summarized_chunks = []
-            for chunk in chunks:
-                if len(chunk.strip()) > 30:
-                    clean_summary = summarize_chunk(chunk)
-                    if clean_summary and clean_summary.lower() not in [s.lower() for s in summarized_chunks]:
-                        summarized_chunks.append(clean_summary)
-            summary_text = " ".join(summarized_chunks)
+            summary_text = summarize_text(full_text)
         else:
             summary_text = summarize_chunk(full_text)
 
-        processing_jobs[filename]['progress'] = 85
-
-        transcript_path = os.path.join(app.config['UPLOAD_FOLDER'], filename + ".txt")
-        summary_path    = os.path.join(app.config['UPLOAD_FOLDER'], filename + "_summary.txt")
+        update_job(filename, stage='saving', progress=85)
 
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(formatted_transcript)
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary_text)
+        _write_results(filename, summary_text, segments=segments)
+        if audio_hash:
+            result_cache.put(result_cache_key(audio_hash, model_name), {
+                'segments': [[s['start'], s['end'], s['text'].strip()] for s in segments],
+                'summary':  summary_text
+            })
 
-        processing_jobs[filename].update({
-            'status': 'completed', 'progress': 100,
-            'transcript': formatted_transcript, 'summary': summary_text
-        })
+        # The transcript itself is not kept in job state; job_status() loads it on completion.
+        update_job(filename, status='completed', stage='completed', progress=100)
+        upload_catalog.set_status(filename, 'completed')
+        schedule_prerender(filename)
         print(f"Transcription completed for: {filename}")
 
     except Exception as e:
         print(f"ERROR in run_transcription for {filename}: {e}")
-        processing_jobs[filename] = {'status': 'error', 'message': str(e), 'progress': 0}
+        set_job(filename, {'status': 'error', 'stage': 'error', 'message': str(e), 'progress': 0})
+        upload_catalog.set_status(filename, 'error')
+
+
+# ============================================================
+# MEDIA POST-PROCESSING
+# ============================================================
+# Next to transcription, each upload gets two small derived files (ffmpeg,
+# background pool):
+#   <name>.peaks.json  – WAVEFORM_POINTS peak levels (0-255) for the player
+#   <name>.preview.m4a – mono AAC at PLAYBACK_BITRATE with the index up front,
+#                        so playback starts after a few kilobytes
+WAVEFORM_POINTS  = int(os.getenv("WAVEFORM_POINTS", 1000))
+WAVEFORM_RATE    = 8000
+PLAYBACK_BITRATE = os.getenv("PLAYBACK_BITRATE", "48k")
+MEDIA_WORKERS    = max(1, int(os.getenv("MEDIA_WORKERS", 2)))
+PEAKS_SUFFIX     = ".peaks.json"
+PREVIEW_SUFFIX   = ".preview.m4a"
+
+media_pool     = concurrent.futures.ThreadPoolExecutor(max_workers=MEDIA_WORKERS, thread_name_prefix="media")
+_media_pending = set()
+_media_lock    = threading.Lock()
+
+
+def compute_peaks(file_path: str, points: int = WAVEFORM_POINTS) -> dict:
+    """Stream-decode to 8 kHz mono and reduce to at most `points` peak levels."""
+    import numpy as np
+    block = WAVEFORM_RATE // 100   # 10 ms per level before the final reduction
+    proc  = subprocess.Popen(
+        ["ffmpeg", "-v", "error", "-i", file_path, "-ac", "1", "-ar", str(WAVEFORM_RATE), "-f", "s16le", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    levels, carry = [], b''
+    try:
+        while True:
+            data = proc.stdout.read(block * 2 * 4096)
+            if not data:
+                break
+            data   = carry + data
+            usable = len(data) - len(data) % (block * 2)
+            carry  = data[usable:]
+            samples = np.frombuffer(data[:usable], dtype='<i2').reshape(-1, block)
+            levels.append(np.abs(samples.astype(np.int32)).max(axis=1))
+    except Exception:
+        proc.kill()
+        raise
+    finally:
+        proc.stdout.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg exited with status {proc.returncode}")
+
+    levels = np.concatenate(levels) if levels else np.zeros(0, dtype=np.int32)
+    peaks  = []
+    if len(levels):
+        edges = np.linspace(0, len(levels), min(points, len(levels)) + 1).astype(np.int64)[:-1]
+        peaks = (np.maximum.reduceat(levels, edges) * 255 // 32768).tolist()
+    return {'duration': round(len(levels) * block / WAVEFORM_RATE, 2), 'points': len(peaks), 'peaks': peaks}
+
+
+def make_playback_rendition(file_path: str, out_path: str) -> None:
+    tmp = f"{out_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-i", file_path, "-vn", "-ac", "1",
+             "-c:a", "aac", "-b:a", PLAYBACK_BITRATE, "-movflags", "+faststart", "-f", "mp4", tmp],
+            check=True, capture_output=True, timeout=3600
+        )
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def process_media(filename: str, file_path: str) -> None:
+    """Build the waveform peaks and the playback rendition for one upload."""
+    base = os.path.join(UPLOAD_FOLDER, filename)
+    try:
+        peaks = compute_peaks(file_path)
+        tmp   = f"{base}{PEAKS_SUFFIX}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(peaks, f, separators=(',', ':'))
+        os.replace(tmp, base + PEAKS_SUFFIX)
+    except Exception as e:
+        print(f"Waveform error for {filename}: {e}")
+    try:
+        make_playback_rendition(file_path, base + PREVIEW_SUFFIX)
+    except Exception as e:
+        print(f"Playback rendition error for {filename}: {e}")
+    finally:
+        with _media_lock:
+            _media_pending.discard(filename)
+
+
+def schedule_media(filename: str, file_path: str, replace: bool = False) -> None:
+    """Queue post-processing; with replace=True, derived files of an earlier upload are dropped first."""
+    with _media_lock:
+        if filename in _media_pending:
+            return
+        _media_pending.add(filename)
+    if replace:
+        for suffix in (PEAKS_SUFFIX, PREVIEW_SUFFIX):
+            path = os.path.join(UPLOAD_FOLDER, filename + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+    media_pool.submit(process_media, filename, file_path)
+
+
+# ============================================================
+# HTTP CACHING & COMPRESSION
+# ============================================================
+# Transcript, export and audio responses carry strong ETags derived from
+# content hashes, so a revalidation (If-None-Match / If-Modified-Since) is a
+# bodyless 304. Text and JSON bodies of at least COMPRESS_MIN_BYTES are sent
+# br-encoded (if the brotli package is installed) or gzip-encoded.
+COMPRESS_MIN_BYTES  = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL      = 6
+BROTLI_QUALITY      = 5
+COMPRESSIBLE_TYPES  = {'application/json', 'text/plain', 'text/html', 'text/vtt', 'application/x-subrip'}
+IMMUTABLE_CACHE     = 'public, max-age=31536000, immutable'
+
+
+def _client_has_current(etag: str, last_modified: float = None) -> bool:
+    """True if the request's validators match this representation (in any content coding)."""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        # If-None-Match uses weak comparison: proxies that re-encode a body
+        # hand back W/"..." for the strong tag we sent.
+        etags = parse_etags(if_none_match)
+        return etags.star_tag or any(etags.contains_weak(t) for t in (etag, f"{etag}-gzip", f"{etag}-br"))
+    since = request.if_modified_since
+    if since is not None and last_modified is not None:
+        return int(last_modified) <= since.timestamp()
+    return False
+
+
+def with_validators(response, etag: str, last_modified: float = None, cache_control: str = 'no-cache'):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def not_modified(etag: str, last_modified: float = None, cache_control: str = 'no-cache'):
+    """A 304 response if the client's cached copy is current, otherwise None."""
+    if not _client_has_current(etag, last_modified):
+        return None
+    return with_validators(Response(status=304), etag, last_modified, cache_control)
+
+
+def cached_json(payload, cache_control: str = 'no-cache'):
+    """jsonify() with a content-hash ETag, answering 304 when the client already has it."""
+    response = jsonify(payload)
+    etag     = hashlib.sha256(response.get_data()).hexdigest()
+    return not_modified(etag, cache_control=cache_control) or with_validators(response, etag, cache_control=cache_control)
+
+
+def _compress_stream(chunks, encoding):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY) if encoding == 'br' else \
+        zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)   # wbits=31: gzip container
+    try:
+        for chunk in chunks:
+            data = compressor.process(chunk) if encoding == 'br' else compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish() if encoding == 'br' else compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers):
+        return response
+    if brotli is not None and request.accept_encodings['br']:
+        encoding = 'br'
+    elif request.accept_encodings['gzip']:
+        encoding = 'gzip'
+    else:
+        return response
+
+    if response.is_streamed:
+        if response.content_length is not None and response.content_length < COMPRESS_MIN_BYTES:
+            return response
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+        else:
+            response.set_data(gzip.compress(data, COMPRESS_LEVEL))
+
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)   # each coding is its own representation
+    return response
+
+
+# ============================================================
+# UPLOAD CATALOG
+# ============================================================
+# Metadata for every upload is kept in a small SQLite catalog that is updated
+# on upload, completion and delete, so the history page is a single indexed
+# query instead of a listdir + stat per file. Pages are fetched by a keyset
+# cursor on (uploaded_at, name), newest first.
+CATALOG_DB        = os.getenv("CATALOG_DB", "catalog.db")
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 20))
+
+
+class UploadCatalog:
+    """Upload metadata, sorted by upload time."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local  = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS uploads (
+                name        TEXT PRIMARY KEY,
+                size        INTEGER NOT NULL,
+                type        TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                status      TEXT NOT NULL DEFAULT 'uploaded',
+                audio_hash  TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_uploads_time ON uploads(uploaded_at DESC, name DESC);
+        """)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(uploads)")}
+        if 'audio_hash' not in columns:
+            conn.execute("ALTER TABLE uploads ADD COLUMN audio_hash TEXT")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, name: str, path: str, status: str = 'uploaded', audio_hash: str = None) -> None:
+        file_type = name.rsplit('.', 1)[1].upper() if '.' in name else 'UNKNOWN'
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (name, size, type, uploaded_at, status, audio_hash)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (name, os.path.getsize(path), file_type, os.path.getmtime(path), status, audio_hash)
+            )
+
+    def get(self, name: str):
+        row = self._conn().execute("SELECT * FROM uploads WHERE name = ?", (name,)).fetchone()
+        return _catalog_entry(row) if row else None
+
+    def set_status(self, name: str, status: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE uploads SET status = ? WHERE name = ?", (status, name))
+
+    def remove(self, name: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM uploads WHERE name = ?", (name,))
+
+    def clear(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM uploads")
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+    def page(self, cursor: str = None, limit: int = HISTORY_PAGE_SIZE):
+        """Return (entries, next_cursor) for one page, newest first."""
+        if cursor:
+            ts, _, name = cursor.partition('|')
+            rows = self._conn().execute(
+                "SELECT * FROM uploads WHERE (uploaded_at, name) < (?, ?)"
+                " ORDER BY uploaded_at DESC, name DESC LIMIT ?",
+                (float(ts), name, limit + 1)
+            ).fetchall()
+        else:
+            rows = self._conn().execute(
+                "SELECT * FROM uploads ORDER BY uploaded_at DESC, name DESC LIMIT ?", (limit + 1,)
+            ).fetchall()
+        entries = [_catalog_entry(r) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = f"{last['uploaded_at']!r}|{last['name']}"
+        return entries, next_cursor
+
+    def rebuild(self, folder: str) -> int:
+        """Index existing uploads once, e.g. on first start after an upgrade."""
+        count = 0
+        for f in os.listdir(folder):
+            if allowed_file(f):
+                self.upsert(f, os.path.join(folder, f), status='completed')
+                count += 1
+        return count
+
+
+def _catalog_entry(row) -> dict:
+    size = row['size']
+    if size >= 1024 * 1024:
+        size_str = f"{size / (1024 * 1024):.1f} MB"
+    else:
+        size_str = f"{size / 1024:.1f} KB"
+    return {
+        'name':      row['name'],
+        'time':      time.ctime(row['uploaded_at']),
+        'timestamp': row['uploaded_at'],
+        'size':      size,
+        'size_str':  size_str,
+        'type':      row['type'],
+        'status':    row['status'],
+        'audio_hash': row['audio_hash'],
+    }
+
+
+upload_catalog = UploadCatalog(CATALOG_DB)
+if not IS_WORKER_PROCESS and not upload_catalog.count():
+    upload_catalog.rebuild(UPLOAD_FOLDER)
 
 
 @app.route('/')
 def index():
-    files = []
-    if os.path.exists(UPLOAD_FOLDER):
-        for f in os.listdir(UPLOAD_FOLDER):
-            if allowed_file(f):
-                path = os.path.join(UPLOAD_FOLDER, f)
-                file_size_bytes = os.path.getsize(path)
-                if file_size_bytes >= 1024 * 1024:
-                    size_str = f"{file_size_bytes / (1024 * 1024):.1f} MB"
-                else:
-                    size_str = f"{file_size_bytes / 1024:.1f} KB"
-                file_type = f.rsplit('.', 1)[1].upper() if '.' in f else 'UNKNOWN'
-                raw_time = os.path.getmtime(path)
-                files.append({
-                    'name': f,
-                    'time': time.ctime(raw_time),
-                    'timestamp': raw_time,
-                    'size': file_size_bytes,
-                    'size_str': size_str,
-                    'type': file_type
-                })
-    files.sort(key=lambda x: x['timestamp'], reverse=True)
-    return render_template('index.html', files=files)
+    files, next_cursor = upload_catalog.page()
+    return render_template('index.html', files=files, next_cursor=next_cursor)
+
+
+@app.route('/history')
+def history():
+    limit = min(max(1, request.args.get('limit', HISTORY_PAGE_SIZE, type=int)), 100)
+    try:
+        files, next_cursor = upload_catalog.page(request.args.get('cursor') or None, limit)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify({'files': files, 'next_cursor': next_cursor})
+
+
+def _queue_full_response():
+    stats = job_scheduler.stats()
+    retry_after = job_scheduler.estimated_wait(stats['queued'] + 1) or 30
+    resp = jsonify({
+        'error': 'Server is busy. Please try again shortly.',
+        'queue_length': stats['queued'],
+        'queue_position': stats['queued'] + 1,
+        'retry_after_sec': retry_after
+    })
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(int(retry_after))
+    return resp
+
+
+def _start_job(filename, staged_path, audio_hash, model_name):
+    """
+    Move a received upload from `staged_path` into place, then complete it from
+    the result cache or queue its transcription. Returns (response, started).
+
+    A queue slot is reserved before anything is replaced, so when the queue is
+    full an earlier upload under the same name (file, catalog row, job state,
+    derived media) is left intact, and so is the staged file.
+    """
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    cached    = result_cache.get(result_cache_key(audio_hash, model_name))
+    if not cached and not job_scheduler.reserve():
+        return _queue_full_response(), False
+    try:
+        if staged_path != file_path:
+            os.replace(staged_path, file_path)
+    except Exception:
+        if not cached:
+            job_scheduler.release()
+        raise
+
+    upload_catalog.upsert(filename, file_path, status='completed' if cached else 'queued', audio_hash=audio_hash)
+    schedule_media(filename, file_path, replace=True)
+    if cached:
+        if 'segments' in cached:
+            segments = [{'start': start, 'end': end, 'text': text} for start, end, text in cached['segments']]
+            _write_results(filename, cached['summary'], segments=segments)
+        else:
+            _write_results(filename, cached['summary'], transcript=cached['transcript'])
+        schedule_prerender(filename)
+        set_job(filename, {
+            'status': 'completed', 'stage': 'completed', 'progress': 100,
+            'model': model_name, 'cached': True
+        })
+        print(f"Result cache hit for: {filename}")
+        return jsonify({
+            'message': 'Upload successful', 'filename': filename, 'model': model_name,
+            'cached': True, 'queue_position': None, 'estimated_wait_sec': 0
+        }), True
+
+    set_job(filename, {
+        'status': 'queued', 'stage': 'queued', 'progress': 5,
+        'model': model_name, 'queued_at': time.time()
+    })
+    position = job_scheduler.submit(
+        filename, run_transcription, file_path, filename, model_name, audio_hash, reserved=True
+    )
+    return jsonify({
+        'message': 'Upload successful', 'filename': filename, 'model': model_name,
+        'queue_position': position,
+        'estimated_wait_sec': job_scheduler.estimated_wait(position)
+    }), True
 
 
 @app.route('/upload', methods=['POST'])
@@ -725,11 +3049,22 @@ def upload_file():
         if file.filename == '':
             return jsonify({'error': 'No selected file'}), 400
         if file and allowed_file(file.filename):
-            filename  = secure_filename(file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            threading.Thread(target=run_transcription, args=(file_path, filename)).start()
-            return jsonify({'message': 'Upload successful', 'filename': filename})
+            try:
+                model_name = resolve_whisper_model(request.form.get('model') or request.form.get('quality'))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if job_scheduler.is_full():
+                return _queue_full_response()
+            filename = secure_filename(file.filename)
+            # Received next to its final path and moved in only once the job is accepted.
+            staged_path = os.path.join(app.config['UPLOAD_FOLDER'], f".{filename}.{uuid.uuid4().hex}.tmp")
+            try:
+                audio_hash = save_upload_hashed(file, staged_path)
+                response, _ = _start_job(filename, staged_path, audio_hash, model_name)
+            finally:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+            return response
         else:
             return jsonify({'error': 'Invalid file type. Allowed: mp3, wav'}), 400
     except Exception as e:
@@ -737,10 +3072,637 @@ def upload_file():
         return jsonify({'error': f"Server Error: {str(e)}"}), 500
 
 
+# ============================================================
+# CHUNKED (RESUMABLE) UPLOADS
+# ============================================================
+# Large recordings are sent as a sequence of chunks: init -> PUT chunk at
+# offset -> finalize. Chunks are streamed straight to a .part file with
+# constant memory. A client that loses its connection asks for the current
+# offset and carries on from there.
+#
+# All session state lives in PARTIAL_FOLDER (the offset is the .part size, the
+# rest is in the .json), and writes take a flock on the session's .lock file,
+# so any gunicorn worker can serve any request of an upload. Lock files are
+# never unlinked, so every worker always locks the same inode. Finalize records
+# each step in the .json and can be retried, or called concurrently, safely.
+PARTIAL_FOLDER          = os.path.join(UPLOAD_FOLDER, '.partial')
+CHUNKED_UPLOAD_MAX_MB   = int(os.getenv("CHUNKED_UPLOAD_MAX_MB", 1024))
+CHUNKED_UPLOAD_CHUNK_MB = int(os.getenv("CHUNKED_UPLOAD_CHUNK_MB", 8))
+CHUNKED_UPLOAD_TTL_SEC  = int(os.getenv("CHUNKED_UPLOAD_TTL_HOURS", 24)) * 3600
+
+os.makedirs(PARTIAL_FOLDER, exist_ok=True)
+
+_UPLOAD_ID    = re.compile(r'^[0-9a-f]{32}$')
+_upload_locks = [threading.Lock() for _ in range(64)]   # striped; the flock covers other processes
+
+
+def _partial_paths(upload_id):
+    return (os.path.join(PARTIAL_FOLDER, upload_id + '.json'),
+            os.path.join(PARTIAL_FOLDER, upload_id + '.part'))
+
+
+@contextlib.contextmanager
+def _upload_lock(upload_id, blocking=True):
+    """
+    Exclusive lock on one upload session, across threads and (with fcntl)
+    processes. Yields False instead of waiting when blocking=False and the
+    session is busy.
+    """
+    local = _upload_locks[int(upload_id[:8], 16) % len(_upload_locks)]
+    if not local.acquire(blocking):
+        yield False
+        return
+    try:
+        if fcntl is None:
+            yield True
+            return
+        with open(os.path.join(PARTIAL_FOLDER, upload_id + '.lock'), 'ab') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    finally:
+        local.release()
+
+
+def _load_upload_session(upload_id):
+    if not _UPLOAD_ID.match(upload_id or ''):
+        return None
+    meta_path, part_path = _partial_paths(upload_id)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if 'audio_hash' in meta:   # assembled by finalize
+        meta['offset'] = meta['size']
+    else:
+        meta['offset'] = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    return meta
+
+
+def _save_upload_session(meta):
+    meta_path, _ = _partial_paths(meta['upload_id'])
+    tmp = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({k: v for k, v in meta.items() if k != 'offset'}, f)
+    os.replace(tmp, meta_path)
+
+
+def _discard_upload_session(upload_id):
+    """
+    Remove a session's .json and .part; call with the session lock held. The
+    .lock file stays: another worker may have it open, and unlinking it would
+    let the next opener lock a fresh file that excludes nobody.
+    """
+    for path in _partial_paths(upload_id):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _sweep_stale_uploads():
+    cutoff = time.time() - CHUNKED_UPLOAD_TTL_SEC
+    for f in os.listdir(PARTIAL_FOLDER):
+        upload_id = f[:-len('.json')]
+        if not f.endswith('.json') or not _UPLOAD_ID.match(upload_id):
+            continue
+        meta_path = os.path.join(PARTIAL_FOLDER, f)
+        try:
+            if os.path.getmtime(meta_path) >= cutoff:
+                continue
+        except FileNotFoundError:
+            continue
+        # A client resuming right at the TTL holds the lock; leave it alone and
+        # re-check the mtime once we have it, since a PUT may have just touched it.
+        with _upload_lock(upload_id, blocking=False) as locked:
+            if not locked:
+                continue
+            try:
+                if os.path.getmtime(meta_path) >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            _discard_upload_session(upload_id)
+
+
+@app.route('/upload/chunked/init', methods=['POST'])
+def chunked_upload_init():
+    data     = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get('filename', ''))
+    size     = data.get('size')
+
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type. Allowed: mp3, wav'}), 400
+    if not isinstance(size, int) or size <= 0:
+        return jsonify({'error': 'Missing or invalid file size'}), 400
+    if size > CHUNKED_UPLOAD_MAX_MB * 1024 * 1024:
+        return jsonify({'error': f'File too large. Max {CHUNKED_UPLOAD_MAX_MB} MB'}), 413
+    try:
+        model_name = resolve_whisper_model(data.get('model') or data.get('quality'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    _sweep_stale_uploads()
+    upload_id = uuid.uuid4().hex
+    _, part_path = _partial_paths(upload_id)
+    open(part_path, 'wb').close()
+    _save_upload_session({'upload_id': upload_id, 'filename': filename, 'size': size,
+                          'model': model_name, 'created': time.time()})
+
+    return jsonify({
+        'upload_id': upload_id, 'offset': 0,
+        'chunk_size': CHUNKED_UPLOAD_CHUNK_MB * 1024 * 1024
+    })
+
+
+@app.route('/upload/chunked/<upload_id>', methods=['GET'])
+def chunked_upload_status(upload_id):
+    meta = _load_upload_session(upload_id)
+    if not meta:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(meta)
+
+
+@app.route('/upload/chunked/<upload_id>', methods=['PUT'])
+def chunked_upload_put(upload_id):
+    meta = _load_upload_session(upload_id)
+    if not meta:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    offset = request.headers.get('X-Upload-Offset', request.args.get('offset'))
+    try:
+        offset = int(offset)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Missing X-Upload-Offset header'}), 400
+
+    meta_path, part_path = _partial_paths(upload_id)
+    with _upload_lock(upload_id, blocking=False) as locked:
+        if not locked:
+            # Another request is appending to this upload right now.
+            return jsonify({'error': 'Upload busy', 'offset': meta['offset']}), 409
+        meta = _load_upload_session(upload_id)
+        if not meta:
+            return jsonify({'error': 'Upload not found'}), 404
+        if 'audio_hash' in meta:
+            return jsonify({'error': 'Upload already finalized', 'offset': meta['offset']}), 409
+        current = meta['offset']
+        if offset != current:
+            # The client is out of sync (e.g. a retried chunk); tell it where to resume.
+            return jsonify({'error': 'Offset mismatch', 'offset': current}), 409
+
+        received = 0
+        with open(part_path, 'ab') as out:
+            while True:
+                block = request.stream.read(HASH_CHUNK_SIZE)
+                if not block:
+                    break
+                if current + received + len(block) > meta['size']:
+                    return jsonify({
+                        'error': 'Chunk exceeds declared file size', 'offset': current + received
+                    }), 400
+                out.write(block)
+                received += len(block)
+        os.utime(meta_path)   # keep the session from being swept
+
+    return jsonify({'upload_id': upload_id, 'offset': current + received, 'size': meta['size']})
+
+
+@app.route('/upload/chunked/<upload_id>/finalize', methods=['POST'])
+def chunked_upload_finalize(upload_id):
+    if not _load_upload_session(upload_id):
+        return jsonify({'error': 'Upload not found'}), 404
+
+    with _upload_lock(upload_id):
+        meta = _load_upload_session(upload_id)
+        if not meta:
+            return jsonify({'error': 'Upload not found'}), 404
+        filename  = meta['filename']
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+        if meta.get('job_started'):
+            # A previous finalize already queued the job: report on it.
+            state = job_status(filename)
+            return jsonify({
+                'message': 'Upload successful', 'filename': filename, 'model': meta['model'],
+                'queue_position': state.get('queue_position'),
+                'estimated_wait_sec': state.get('estimated_wait_sec', 0)
+            })
+
+        _, part_path = _partial_paths(upload_id)
+        if 'audio_hash' not in meta:
+            if meta['offset'] != meta['size']:
+                return jsonify({'error': 'Upload incomplete', 'offset': meta['offset'], 'size': meta['size']}), 409
+            if job_scheduler.is_full():
+                return _queue_full_response()
+            meta['audio_hash'] = hash_file(part_path)
+            _save_upload_session(meta)
+
+        # On a full queue the assembled .part stays put and finalize can be
+        # retried; if an earlier attempt already moved it, start from there.
+        staged_path = part_path if os.path.exists(part_path) else file_path
+        response, started = _start_job(filename, staged_path, meta['audio_hash'], meta['model'])
+        if started:
+            meta['job_started'] = True
+            _save_upload_session(meta)
+        return response
+
+
+def job_status(job_id, state=None) -> dict:
+    """Job state enriched with queue position and wait times."""
+    status_data = dict(state if state is not None else (get_job(job_id) or {'status': 'initializing', 'progress': 5}))
+    queued_at = status_data.get('queued_at')
+    if status_data.get('status') == 'queued':
+        position = job_scheduler.position(job_id)
+        status_data['queue_position']     = position
+        status_data['estimated_wait_sec'] = job_scheduler.estimated_wait(position)
+        if queued_at:
+            status_data['wait_sec'] = round(time.time() - queued_at, 1)
+    elif queued_at and status_data.get('started_at'):
+        status_data['wait_sec'] = round(status_data['started_at'] - queued_at, 1)
+    if status_data.get('status') == 'completed' and 'transcript' not in status_data:
+        results = load_results(job_id)
+        if results:
+            status_data['transcript'], status_data['summary'] = results
+    return status_data
+
+
 @app.route('/check_status/<filename>')
 def check_status(filename):
-    status_data = processing_jobs.get(filename, {'status': 'initializing', 'progress': 5})
-    return jsonify(status_data)
+    return cached_json(job_status(filename))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/jobs/<job_id>/segments')
+def job_segments(job_id):
+    # Segments decoded so far, starting at index `since`.
+    since    = max(0, request.args.get('since', 0, type=int))
+    state    = get_job(job_id) or {}
+    segments = get_job_segments(job_id, since)
+    return jsonify({
+        'status':   state.get('status', 'initializing'),
+        'since':    since,
+        'next':     since + len(segments),
+        'segments': segments,
+        'done':     state.get('status') in JOB_TERMINAL_STATES,
+    })
+
+
+# Finished transcripts are served a page at a time straight from the segment
+# store: by index (offset/limit) or by time (start/end seconds, located with a
+# binary search over the segment start times), so a page costs O(limit).
+SEGMENT_PAGE_DEFAULT = 100
+SEGMENT_PAGE_MAX     = 1000
+
+
+@app.route('/transcripts/<filename>/segments')
+def transcript_segments(filename):
+    segs = open_segments(filename)
+    if segs is None:
+        return jsonify({'error': 'Transcript not found'}), 404
+
+    try:
+        limit = int(request.args.get('limit', SEGMENT_PAGE_DEFAULT))
+        if 'start' in request.args or 'end' in request.args:
+            start = float(request.args.get('start', 0))
+            end   = float(request.args.get('end', 'inf'))
+            first, stop = segs.window(start, end)
+            first = max(first, int(request.args.get('offset', first)))
+        else:
+            first = int(request.args.get('offset', 0))
+            stop  = len(segs)
+    except ValueError:
+        return jsonify({'error': 'offset/limit must be integers and start/end numbers of seconds'}), 400
+    if first < 0 or limit < 1:
+        return jsonify({'error': 'offset must be >= 0 and limit >= 1'}), 400
+
+    limit = min(limit, SEGMENT_PAGE_MAX)
+    last  = min(stop, first + limit)
+    return cached_json({
+        'total':    len(segs),
+        'duration': round(segs.duration, 2),
+        'offset':   first,
+        'next':     last if last < stop else None,
+        'segments': [_format_segment(i, segs.segment(i)) for i in range(first, last)],
+    })
+
+
+@app.route('/jobs/<job_id>/events')
+def job_event_stream(job_id):
+    """
+    Server-Sent Events stream of a job's progress.
+
+    Emits 'progress' on every state change, 'stage' when the stage changes,
+    'segments' with newly decoded transcript segments and a single 'result'
+    (or 'error') event carrying the final transcript, then closes. Clients
+    without EventSource can keep polling /check_status. Unknown jobs get a
+    404; a job deleted while streaming ends the stream with an 'error' event.
+    """
+    if get_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        q = job_events.subscribe(job_id)
+        try:
+            state = job_status(job_id)
+            last_stage, sent_segments = None, 0
+            last_sent = time.time()
+            while True:
+                if state.get('segment_count', 0) > sent_segments:
+                    new_segments = get_job_segments(job_id, sent_segments)
+                    if new_segments:
+                        yield _sse('segments', {'since': sent_segments, 'segments': new_segments})
+                        sent_segments += len(new_segments)
+                if state.get('status') in JOB_TERMINAL_STATES:
+                    yield _sse('result' if state['status'] == 'completed' else 'error', state)
+                    return
+                if state.get('stage') != last_stage:
+                    last_stage = state.get('stage')
+                    yield _sse('stage', {'stage': last_stage})
+                yield _sse('progress', {k: v for k, v in state.items() if k not in ('transcript', 'summary')})
+                last_sent = time.time()
+
+                # Wait for the next change. Local writes arrive on the queue; with a
+                # shared store another process may be running the job, so also poll
+                # its version. While queued, refresh so the queue position stays current.
+                while True:
+                    if job_store.shared:
+                        timeout = 1
+                    else:
+                        timeout = 3 if state.get('status') == 'queued' else 15
+                    try:
+                        state = job_status(job_id, q.get(timeout=timeout))
+                        break
+                    except queue.Empty:
+                        pass
+                    current = get_job(job_id)
+                    if current is None:
+                        yield _sse('error', {'status': 'error', 'error': 'Job not found'})
+                        return
+                    latest = job_status(job_id, current)
+                    if latest.get('version') != state.get('version') or latest.get('status') == 'queued':
+                        state = latest
+                        break
+                    if time.time() - last_sent >= 15:
+                        yield ": keep-alive\n\n"
+                        last_sent = time.time()
+        finally:
+            job_events.unsubscribe(job_id, q)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/queue_status')
+def queue_status():
+    return jsonify(job_scheduler.stats())
+
+
+# ============================================================
+# TRANSLATION
+# ============================================================
+# Translations are cached per transcript segment in a small SQLite database,
+# keyed by (text hash, source, target). Repeated lines and previously
+# translated files are served without calling the translator again.
+TRANSLATION_DB                = os.path.join(CACHE_FOLDER, 'translations.db')
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", 200000))
+TRANSLATE_MAX_CHARS           = 4500
+
+_SEGMENT_PREFIX = re.compile(r'^(\[[^\]]*\]\s*)?(.*)$', re.S)
+
+
+class TranslationMemory:
+    """Persistent segment-level translation cache with LRU eviction."""
+
+    def __init__(self, db_path: str, max_entries: int):
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self._lock       = threading.Lock()
+        self._conn       = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY, translated TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text: str, source: str, target: str) -> str:
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{source}:{target}:{digest}"
+
+    def get_many(self, keys) -> dict:
+        keys = list(set(keys))
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i+500]
+                rows = self._conn.execute(
+                    f"SELECT key, translated FROM translations WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?", [(now, k) for k in found]
+                )
+                self._conn.commit()
+            self.hits   += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: dict) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translated, last_used) VALUES (?, ?, ?)",
+                [(k, v, now) for k, v in items.items()]
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    " SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'entries': entries, 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
+
+
+translation_memory = TranslationMemory(TRANSLATION_DB, TRANSLATION_CACHE_MAX_ENTRIES)
+
+
+# Translator backends by name. Anything with translate(text) -> str and a
+# (source=, target=) constructor works, which is how tests plug in a fake.
+TRANSLATOR_BACKENDS = {'google': GoogleTranslator}
+TRANSLATOR_BACKEND  = os.getenv("TRANSLATOR_BACKEND", "google")
+TRANSLATE_CONCURRENCY  = max(1, int(os.getenv("TRANSLATE_CONCURRENCY", 4)))
+TRANSLATE_RATE_PER_SEC = float(os.getenv("TRANSLATE_RATE_PER_SEC", 5))
+TRANSLATE_RETRIES      = int(os.getenv("TRANSLATE_RETRIES", 3))
+
+
+class RateLimiter:
+    """Token bucket shared by all threads calling one backend."""
+
+    def __init__(self, rate_per_sec: float, burst: int = None):
+        self.rate     = rate_per_sec
+        self.capacity = burst or max(1, int(rate_per_sec))
+        self._tokens  = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters      = {}
+_rate_limiters_lock = threading.Lock()
+translate_pool      = concurrent.futures.ThreadPoolExecutor(
+    max_workers=TRANSLATE_CONCURRENCY, thread_name_prefix="translate"
+)
+
+
+def _get_rate_limiter(backend: str) -> RateLimiter:
+    with _rate_limiters_lock:
+        if backend not in _rate_limiters:
+            _rate_limiters[backend] = RateLimiter(TRANSLATE_RATE_PER_SEC)
+        return _rate_limiters[backend]
+
+
+def _call_translator(backend, source, target, text) -> str:
+    """One rate-limited translator call, retried with exponential backoff."""
+    limiter = _get_rate_limiter(backend)
+    for attempt in range(TRANSLATE_RETRIES + 1):
+        limiter.acquire()
+        try:
+            return TRANSLATOR_BACKENDS[backend](source=source, target=target).translate(text) or ""
+        except Exception as e:
+            if attempt == TRANSLATE_RETRIES:
+                raise
+            delay = (2 ** attempt) * 0.5 + random.uniform(0, 0.25)
+            print(f"Translation retry {attempt + 1}/{TRANSLATE_RETRIES} in {delay:.1f}s: {e}")
+            time.sleep(delay)
+
+
+def _pack_batches(bodies) -> list:
+    """Group segment texts into requests of at most TRANSLATE_MAX_CHARS, preserving order."""
+    batches, batch, batch_len = [], [], 0
+    for body in bodies:
+        if len(body) > TRANSLATE_MAX_CHARS:
+            if batch:
+                batches.append(batch)
+            batches.append([body])
+            batch, batch_len = [], 0
+            continue
+        if batch and batch_len + len(body) + 1 > TRANSLATE_MAX_CHARS:
+            batches.append(batch)
+            batch, batch_len = [], 0
+        batch.append(body)
+        batch_len += len(body) + 1
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _translate_batch(batch, backend, source, target) -> list:
+    if len(batch) == 1 and len(batch[0]) > TRANSLATE_MAX_CHARS:
+        body = batch[0]
+        return ["".join(
+            _call_translator(backend, source, target, body[i:i+TRANSLATE_MAX_CHARS])
+            for i in range(0, len(body), TRANSLATE_MAX_CHARS)
+        )]
+    parts = _call_translator(backend, source, target, "\n".join(batch)).split("\n")
+    if len(parts) != len(batch):
+        # The translator merged or split lines; fall back to one request per segment.
+        parts = [_call_translator(backend, source, target, b) or b for b in batch]
+    return [p.strip() for p in parts]
+
+
+def _translate_segments(bodies, source, target, backend) -> list:
+    """Translate unique segment texts through the bounded pool; results come back in order."""
+    futures = [
+        translate_pool.submit(_translate_batch, batch, backend, source, target)
+        for batch in _pack_batches(bodies)
+    ]
+    results = []
+    for f in futures:
+        results.extend(f.result())
+    return results
+
+
+def translate_texts(texts, target: str, source: str = 'auto', backend: str = None) -> list:
+    """
+    Translate several texts (e.g. transcript and summary) together, segment by segment.
+
+    Timestamp prefixes like "[00:00:01 - 00:00:05] " are kept as-is and only the
+    spoken text is translated. Segments already in the translation memory are
+    not sent again; the rest are translated concurrently. Raises if the
+    translator keeps failing.
+    """
+    backend = backend or TRANSLATOR_BACKEND
+    parsed_texts = []
+    for text in texts:
+        parsed = [_SEGMENT_PREFIX.match(line).groups() for line in (text or "").split("\n")]
+        parsed_texts.append([(prefix or "", body.strip()) for prefix, body in parsed])
+
+    keys = {}
+    for parsed in parsed_texts:
+        for _, body in parsed:
+            if body and body not in keys:
+                keys[body] = TranslationMemory.make_key(body, source, target)
+
+    cached = translation_memory.get_many(keys.values())
+    misses = [b for b in keys if keys[b] not in cached]
+    if misses:
+        translated = _translate_segments(misses, source, target, backend)
+        fresh = {keys[b]: t for b, t in zip(misses, translated) if t}
+        translation_memory.put_many(fresh)
+        cached.update(fresh)
+
+    results = []
+    for text, parsed in zip(texts, parsed_texts):
+        if not text or not text.strip():
+            results.append(text or "")
+            continue
+        results.append("\n".join(
+            prefix + (cached.get(keys[body], body) if body else "") for prefix, body in parsed
+        ))
+    return results
+
+
+def translate_text(text: str, target: str, source: str = 'auto') -> str:
+    return translate_texts([text], target, source)[0]
 
 
 @app.route('/translate_on_fly', methods=['POST'])
@@ -750,322 +3712,363 @@ def translate_on_fly():
     summary     = data.get('summary', '')
     target_lang = data.get('target', 'en')
     try:
-        translator = GoogleTranslator(source='auto', target=target_lang)
-        translated_text = ""
-        for chunk in [transcript[i:i+4500] for i in range(0, len(transcript), 4500)]:
-            translated_text += translator.translate(chunk)
-        translated_summary = translator.translate(summary) if summary else ""
+        translated_text, translated_summary = translate_texts([transcript, summary], target_lang)
         return jsonify({'success': True, 'translated_text': translated_text, 'translated_summary': translated_summary})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 # ============================================================
-# MULTILINGUAL PDF GENERATION
+# PDF RENDER POOL
 # ============================================================
+# ReportLab layout is pure-Python and CPU bound, so large exports are rendered
+# in dedicated worker processes (fonts registered once per worker) and never
+# hold the GIL of the web process. PDF_RENDER_WORKERS=0 renders inline.
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", 2))
+
+
+class RenderPool:
+    """Runs PDF renders and tracks their throughput in pages per second."""
+
+    def __init__(self, size: int):
+        self.size      = size
+        self._ctx      = multiprocessing.get_context('spawn')
+        self._executor = None
+        self._lock     = threading.Lock()
+        self.renders   = 0
+        self.failures  = 0
+        self.pages     = 0
+        self.seconds   = 0.0
+        self.last_pages_per_sec = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.size, mp_context=self._ctx, initializer=render_worker_init
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def render_pdf(self, buf, title: str, transcription: str, summary: str, language: str) -> int:
+        """Render a PDF into the writable binary file `buf`. Returns the page count."""
+        try:
+            if self.size <= 0:
+                pages, seconds = render_pdf_task(buf, title, transcription, summary, language)
+            else:
+                pages, seconds = self._render_in_worker(buf, title, transcription, summary, language)
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        with self._lock:
+            self.renders += 1
+            self.pages   += pages
+            self.seconds += seconds
+            self.last_pages_per_sec = round(pages / seconds, 1) if seconds else None
+        return pages
+
+    def _render_in_worker(self, buf, title, transcription, summary, language):
+        # Each render gets its own temp file, copied into the caller's buffer.
+        fd, path = tempfile.mkstemp(prefix='tf-render-', suffix='.pdf')
+        os.close(fd)
+        try:
+            future = self._get_executor().submit(
+                render_pdf_task, path, title, transcription, summary, language
+            )
+            try:
+                pages, seconds = future.result()
+            except concurrent.futures.BrokenExecutor:
+                self._reset_executor()
+                raise
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, buf, EXPORT_CHUNK_BYTES)
+            return pages, seconds
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
-# Directory where TTF font files live (Arabic, Hindi, Latin only)
-# CJK languages use ReportLab's built-in CID fonts — no font files needed.
-FONTS_DIR = os.path.join(os.getcwd(), 'fonts')
-
-# ── CID fonts (built into every ReportLab installation) ──────────────────────
-# These are PDF standard CJK fonts. Zero external files required.
-# The PDF viewer on the end-user's machine supplies the actual glyphs,
-# which is why characters render correctly.
-CID_FONT_MAP = {
-    'ja':    'HeiseiKakuGo-W5',   # Japanese
-    'zh':    'STSong-Light',       # Chinese Simplified
-    'zh-cn': 'STSong-Light',       # Chinese Simplified
-    'zh-tw': 'STSong-Light',       # Chinese Traditional (best available built-in)
-    'ko':    'HYGothic-Medium',    # Korean
-}
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.size, 'renders': self.renders, 'failures': self.failures,
+                'pages': self.pages, 'render_seconds': round(self.seconds, 2),
+                'pages_per_sec': round(self.pages / self.seconds, 1) if self.seconds else None,
+                'last_pages_per_sec': self.last_pages_per_sec,
+            }
 
-# ── TTF fonts (files must exist in FONTS_DIR) ─────────────────────────────────
-TTF_FONT_MAP = {
-    'NotoSansArabic':     'NotoSansArabic-Regular.ttf',
-    'NotoSansDevanagari': 'NotoSansDevanagari-Regular.ttf',
-    'NotoSans':           'NotoSans-Regular.ttf',
-}
 
-_cid_registered = set()
-_ttf_registered = set()
+render_pool = RenderPool(PDF_RENDER_WORKERS)
 
 
-def _register_cid(cid_name: str) -> bool:
-    """Register a CID font with pdfmetrics once. Returns True on success."""
-    if cid_name in _cid_registered:
-        return True
-    try:
-        pdfmetrics.registerFont(UnicodeCIDFont(cid_name))
-        _cid_registered.add(cid_name)
-        print(f"Registered CID font: {cid_name}")
-        return True
-    except Exception as e:
-        print(f"WARNING: Could not register CID font '{cid_name}': {e}")
-        return False
+# ============================================================
+# DOWNLOAD ROUTE
+# ============================================================
+# PDFs are rendered into a per-request spooled buffer (RAM up to
+# PDF_SPOOL_MAX_MB, then an anonymous temp file) and streamed back in chunks,
+# so concurrent exports never share a path and nothing is read back whole.
+PDF_SPOOL_MAX_MB   = int(os.getenv("PDF_SPOOL_MAX_MB", 8))
+EXPORT_CHUNK_BYTES = 64 * 1024
 
 
-def _register_ttf(font_name: str) -> bool:
-    """Register a TTF font from FONTS_DIR with pdfmetrics once. Returns True on success."""
-    if font_name in _ttf_registered:
-        return True
-    filename = TTF_FONT_MAP.get(font_name)
-    if not filename:
-        return False
-    path = os.path.join(FONTS_DIR, filename)
-    if not os.path.exists(path):
-        print(f"WARNING: TTF font file not found: {path}  (run get_fonts.py to download it)")
-        return False
+def _stream_buffer(buf, chunk_size: int = EXPORT_CHUNK_BYTES):
+    """Yield a rewound buffer in chunks and close it when done."""
     try:
-        pdfmetrics.registerFont(TTFont(font_name, path))
-        _ttf_registered.add(font_name)
-        print(f"Registered TTF font: {font_name}")
-        return True
-    except Exception as e:
-        print(f"WARNING: Could not register TTF font '{font_name}': {e}")
-        return False
+        buf.seek(0)
+        while True:
+            chunk = buf.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        buf.close()
 
 
-def _xml_escape(text: str) -> str:
-    """Escape &, <, > so ReportLab's XML Paragraph parser doesn't crash."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+# Finished exports are cached by (transcript content hash, language, format),
+# so repeat downloads skip translation and layout and are streamed from disk.
+EXPORT_CACHE_MAX_MB = int(os.getenv("EXPORT_CACHE_MAX_MB", 500))
+EXPORT_PRERENDER    = os.getenv("EXPORT_PRERENDER", "0") == "1"
+EXPORT_MIMETYPES    = {'txt': 'text/plain', 'pdf': 'application/pdf'}
 
 
-def _get_font_config(language: str) -> dict:
-    """
-    Return rendering configuration for the given language code.
+class ExportCache(ResultCache):
+    """Size-bounded cache of rendered TXT/PDF files."""
 
-    Returned dict keys:
-        font_name  – name to pass to ParagraphStyle
-        word_wrap  – 'CJK' for Japanese/Chinese/Korean, 'LTR' otherwise
-        alignment  – 0 = left, 2 = right (Arabic/RTL)
-        ok         – True if font registered successfully
-    """
-    lang = (language or 'en').lower().strip()
+    def __init__(self, directory: str, max_bytes: int):
+        super().__init__(directory, max_bytes, suffix='.export')
 
-    # ── CJK: use built-in CID fonts (no file needed) ──────────────────────
-    if lang in CID_FONT_MAP:
-        cid_name = CID_FONT_MAP[lang]
-        ok = _register_cid(cid_name)
-        return {
-            'font_name': cid_name if ok else 'Helvetica',
-            'word_wrap': 'CJK',
-            'alignment': 0,
-            'ok':        ok,
-        }
+    @staticmethod
+    def export_key(transcript: str, summary: str, target_lang: str, file_type: str) -> str:
+        content_hash = hashlib.sha256(f"{summary}\0{transcript}".encode('utf-8')).hexdigest()
+        return ResultCache.make_key(content_hash, target_lang, file_type)
 
-    # ── Arabic / Persian / Urdu: TTF + right-align ────────────────────────
-    if lang in ('ar', 'fa', 'ur'):
-        ok = _register_ttf('NotoSansArabic')
-        return {
-            'font_name': 'NotoSansArabic' if ok else 'Helvetica',
-            'word_wrap': 'LTR',
-            'alignment': 2,   # right-align
-            'ok':        ok,
-        }
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
 
-    # ── Hindi / Devanagari: TTF ────────────────────────────────────────────
-    if lang == 'hi':
-        ok = _register_ttf('NotoSansDevanagari')
-        return {
-            'font_name': 'NotoSansDevanagari' if ok else 'Helvetica',
-            'word_wrap': 'LTR',
-            'alignment': 0,
-            'ok':        ok,
-        }
+    def open(self, key: str):
+        """Return an open binary file for a cached export, or None."""
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+            os.utime(path)   # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return f
 
-    # ── Latin / default ───────────────────────────────────────────────────
-    ok = _register_ttf('NotoSans')
-    return {
-        'font_name': 'NotoSans' if ok else 'Helvetica',
-        'word_wrap': 'LTR',
-        'alignment': 0,
-        'ok':        ok,
-    }
+    def put_stream(self, key: str, buf) -> None:
+        buf.seek(0)
+        self._store(key, lambda f: shutil.copyfileobj(buf, f, EXPORT_CHUNK_BYTES))
 
 
-def create_multilingual_pdf(output_path: str, title: str,
-                             transcription: str, summary: str,
-                             language: str = 'en') -> None:
-    """
-    Build a properly-rendered multilingual PDF.
+export_cache = ExportCache(os.path.join(CACHE_FOLDER, 'exports'), EXPORT_CACHE_MAX_MB * 1024 * 1024)
 
-    CJK languages (ja, zh, zh-cn, zh-tw, ko) use ReportLab's built-in
-    CID fonts — no downloaded font files needed, guaranteed glyph rendering.
 
-    Arabic / Hindi use Noto TTF files from ./fonts/.
-    Latin falls back to NotoSans TTF or Helvetica.
+def render_export(transcript: str, summary: str, target_lang: str, file_type: str):
     """
-    fc        = _get_font_config(language)
-    font_name = fc['font_name']
-    word_wrap = fc['word_wrap']
-    alignment = fc['alignment']
-
-    if not fc['ok']:
-        print(f"WARNING: Falling back to Helvetica for lang='{language}'. "
-              "Non-Latin characters may render as boxes.")
-
-    lang_label = language.upper() if language and language not in ('auto', '') else ''
-
-    # ── Paragraph styles ──────────────────────────────────────────────────
-    title_style = ParagraphStyle(
-        "TFTitle",
-        fontName=font_name,
-        fontSize=18,
-        leading=26,
-        alignment=1,           # always centre
-        spaceAfter=8,
-    )
-    heading_style = ParagraphStyle(
-        "TFHeading",
-        fontName=font_name,
-        fontSize=13,
-        leading=18,
-        alignment=alignment,
-        spaceBefore=12,
-        spaceAfter=4,
-    )
-    body_style = ParagraphStyle(
-        "TFBody",
-        fontName=font_name,
-        fontSize=10,
-        leading=15,
-        alignment=alignment,
-        wordWrap=word_wrap,
-        spaceAfter=3,
-    )
+    Translate (if needed) and render an export into a spooled buffer.
 
-    # ── Flowables ─────────────────────────────────────────────────────────
-    story = []
-    story.append(Paragraph(_xml_escape(title), title_style))
-    story.append(HRFlowable(width="100%", thickness=1, color="#00aacc"))
-    story.append(Spacer(1, 5 * mm))
+    Returns (buffer, cacheable); cacheable is False when translation failed
+    and the untranslated text was rendered instead.
+    """
+    cacheable = True
+    if target_lang != 'en':
+        try:
+            transcript, summary = translate_texts([transcript, summary], target_lang)
+        except Exception as e:
+            print(f"Translation Error during download: {e}")
+            cacheable = False
 
-    summary_heading = f"Summary ({lang_label})" if lang_label else "Summary"
-    story.append(Paragraph(_xml_escape(summary_heading), heading_style))
+    buf = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MB * 1024 * 1024)
+    try:
+        if file_type == 'pdf':
+            render_pool.render_pdf(
+                buf,
+                title="TranscribeFlow Report",
+                transcription=transcript,
+                summary=summary,
+                language=target_lang,
+            )
+        else:
+            buf.write(f"SUMMARY:\n{summary}\n\nTRANSCRIPT:\n{transcript}".encode('utf-8'))
+    except Exception:
+        buf.close()
+        raise
+    return buf, cacheable
+
+
+def prerender_exports(filename: str, target_lang: str = 'en') -> None:
+    """Render and cache the TXT and PDF exports ahead of the first download."""
+    results = load_results(filename)
+    if results is None:
+        return
+    transcript, summary = results
+    for file_type in EXPORT_MIMETYPES:
+        key = ExportCache.export_key(transcript, summary, target_lang, file_type)
+        if export_cache.contains(key):
+            continue
+        try:
+            buf, cacheable = render_export(transcript, summary, target_lang, file_type)
+        except Exception as e:
+            print(f"Export pre-render error ({file_type}): {e}")
+            continue
+        with buf:
+            if cacheable:
+                export_cache.put_stream(key, buf)
 
-    if summary and summary.strip():
-        for para in summary.split('\n'):
-            if para.strip():
-                story.append(Paragraph(_xml_escape(para), body_style))
-    else:
-        story.append(Paragraph("No summary available.", body_style))
 
-    story.append(Spacer(1, 6 * mm))
-    story.append(HRFlowable(width="100%", thickness=0.5, color="#cccccc"))
+def schedule_prerender(filename: str) -> None:
+    if EXPORT_PRERENDER:
+        threading.Thread(
+            target=prerender_exports, args=(filename,), name="export-prerender", daemon=True
+        ).start()
 
-    transcript_heading = f"Transcript ({lang_label})" if lang_label else "Transcript"
-    story.append(Paragraph(_xml_escape(transcript_heading), heading_style))
 
-    if transcription and transcription.strip():
-        for line in transcription.split('\n'):
-            if line.strip():
-                story.append(Paragraph(_xml_escape(line), body_style))
-    else:
-        story.append(Paragraph("No transcription available.", body_style))
-
-    # ── Build ─────────────────────────────────────────────────────────────
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        rightMargin=20 * mm,
-        leftMargin=20 * mm,
-        topMargin=20 * mm,
-        bottomMargin=20 * mm,
+def _export_response(buf, file_type: str, download_name: str) -> Response:
+    buf.seek(0, os.SEEK_END)
+    size = buf.tell()
+    return Response(
+        _stream_buffer(buf),
+        mimetype=EXPORT_MIMETYPES[file_type],
+        headers={
+            "Content-Disposition": f"attachment;filename={download_name}",
+            "Content-Length":      str(size),
+        }
     )
-    doc.build(story)
-    print(f"PDF generated: {output_path}  (font={font_name}, lang={language})")
 
 
-# ============================================================
-# DOWNLOAD ROUTE
-# ============================================================
+def _subtitle_response(filename, file_type, target_lang):
+    """Stream an SRT/VTT file straight from the segment store."""
+    segs    = open_segments(filename)
+    results = load_results(filename)
+    if segs is None or results is None:
+        return "Subtitle data not found. Please wait for processing to complete.", 404
+
+    etag = ExportCache.export_key(*results, target_lang, file_type)
+    hit  = not_modified(etag)
+    if hit:
+        return hit
+
+    texts = None
+    if target_lang != 'en' and len(segs):
+        try:
+            texts = translate_texts([segs.text(i) for i in range(len(segs))], target_lang)
+        except Exception as e:
+            print(f"Translation Error during download: {e}")
+            etag = None
+
+    mimetype, render = SUBTITLE_FORMATS[file_type]
+    response = Response(
+        (chunk.encode('utf-8') for chunk in render(segs, texts)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment;filename={filename}_{target_lang}.{file_type}"}
+    )
+    return with_validators(response, etag) if etag else response
+
 
 @app.route('/download/<filename>')
 def download_file(filename):
     file_type   = request.args.get('type', 'txt')
     target_lang = request.args.get('lang', 'en')
 
-    transcript_path = os.path.join(app.config['UPLOAD_FOLDER'], filename + ".txt")
-    summary_path    = os.path.join(app.config['UPLOAD_FOLDER'], filename + "_summary.txt")
+    if file_type in SUBTITLE_FORMATS:
+        return _subtitle_response(filename, file_type, target_lang)
+    if file_type not in EXPORT_MIMETYPES:
+        file_type = 'txt'
 
-    if not os.path.exists(transcript_path):
+    results = load_results(filename)
+    if results is None:
         return "File data not found. Please wait for processing to complete.", 404
-
-    with open(transcript_path, "r", encoding="utf-8") as f:
-        transcript = f.read()
-    with open(summary_path, "r", encoding="utf-8") as f:
-        summary = f.read()
-
-    # Translate if needed
-    if target_lang != 'en':
-        try:
-            translator = GoogleTranslator(source='auto', target=target_lang)
-            summary = translator.translate(summary) if summary else ""
-            chunks = [transcript[i:i+4500] for i in range(0, len(transcript), 4500)]
-            translated_chunks = []
-            for c in chunks:
-                if c.strip():
-                    translated_chunks.append(translator.translate(c))
-                else:
-                    translated_chunks.append(c)
-            transcript = "".join(translated_chunks)
-        except Exception as e:
-            print(f"Translation Error during download: {e}")
+    transcript, summary = results
 
     if file_type == 'pdf':
-        try:
-            safe_base    = secure_filename(filename)
-            pdf_filename = f"{safe_base}_{target_lang}.pdf"
-            pdf_path     = os.path.join(app.config['UPLOAD_FOLDER'], pdf_filename)
-
-            create_multilingual_pdf(
-                output_path=pdf_path,
-                title="TranscribeFlow Report",
-                transcription=transcript,
-                summary=summary,
-                language=target_lang,
-            )
+        download_name = f"{secure_filename(filename)}_{target_lang}.pdf"
+    else:
+        download_name = f"{filename}_{target_lang}.txt"
 
-            with open(pdf_path, 'rb') as f:
-                pdf_bytes = f.read()
+    # The export cache key is a content hash, so it doubles as the ETag.
+    key = ExportCache.export_key(transcript, summary, target_lang, file_type)
+    hit = not_modified(key)
+    if hit:
+        return hit
 
-            try:
-                os.remove(pdf_path)
-            except Exception:
-                pass
+    cached = export_cache.open(key)
+    if cached:
+        return with_validators(_export_response(cached, file_type, download_name), key)
 
-            return Response(
-                pdf_bytes,
-                mimetype="application/pdf",
-                headers={"Content-Disposition": f"attachment;filename={pdf_filename}"}
-            )
-
-        except Exception as e:
-            print(f"PDF generation error: {e}")
-            return f"Error generating PDF: {str(e)}", 500
+    try:
+        buf, cacheable = render_export(transcript, summary, target_lang, file_type)
+    except Exception as e:
+        print(f"PDF generation error: {e}")
+        return f"Error generating PDF: {str(e)}", 500
 
-    # Plain-text download
-    txt_content = f"SUMMARY:\n{summary}\n\nTRANSCRIPT:\n{transcript}"
-    return Response(
-        txt_content.encode('utf-8'),
-        mimetype="text/plain",
-        headers={"Content-Disposition": f"attachment;filename={filename}_{target_lang}.txt"}
-    )
+    if not cacheable:
+        return _export_response(buf, file_type, download_name)
+    export_cache.put_stream(key, buf)
+    return with_validators(_export_response(buf, file_type, download_name), key)
 
 
 @app.route('/serve_audio/<filename>')
 def serve_audio(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    # Range requests and conditional GETs are handled by send_file. The ETag is
+    # the upload's SHA-256 when known; URLs versioned with ?v=<hash prefix> are
+    # immutable, anything else must revalidate. ?rendition=preview serves the
+    # low-bitrate playback copy once it exists, else the original - which is
+    # never cached as immutable, or the preview URL would keep pointing at it.
+    entry      = upload_catalog.get(filename)
+    audio_hash = entry['audio_hash'] if entry else None
+    preview    = filename + PREVIEW_SUFFIX
+    fallback   = False
+    if request.args.get('rendition') == 'preview' and os.path.exists(os.path.join(UPLOAD_FOLDER, preview)):
+        response = send_from_directory(
+            app.config['UPLOAD_FOLDER'], preview, mimetype='audio/mp4', conditional=True,
+            etag=f"{audio_hash}-preview" if audio_hash else True
+        )
+    else:
+        response = send_from_directory(
+            app.config['UPLOAD_FOLDER'], filename, conditional=True, etag=audio_hash or True
+        )
+        fallback = request.args.get('rendition') == 'preview'
+    version = request.args.get('v')
+    if audio_hash and version and audio_hash.startswith(version) and not fallback:
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/waveform/<filename>')
+def waveform(filename):
+    peaks_path = os.path.join(UPLOAD_FOLDER, filename + PEAKS_SUFFIX)
+    if not os.path.exists(peaks_path):
+        audio_path = os.path.join(UPLOAD_FOLDER, filename)
+        if not allowed_file(filename) or not os.path.exists(audio_path):
+            return jsonify({'error': 'File not found'}), 404
+        schedule_media(filename, audio_path)   # uploads from before post-processing existed
+        return jsonify({'status': 'pending'}), 202
+    with open(peaks_path, 'r', encoding='utf-8') as f:
+        return cached_json(json.load(f))
 
 
 @app.route('/delete/<filename>', methods=['POST'])
 def delete_file(filename):
     try:
+        delete_job(filename)
+        upload_catalog.remove(filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         if os.path.exists(file_path):
             os.remove(file_path)
-        for ext in [".txt", "_summary.txt"]:
+        for ext in [".txt", "_summary.txt", SEGMENTS_SUFFIX, PEAKS_SUFFIX, PREVIEW_SUFFIX]:
             extra_file = os.path.join(app.config['UPLOAD_FOLDER'], filename + ext)
             if os.path.exists(extra_file):
                 os.remove(extra_file)
@@ -1076,6 +4079,7 @@ def delete_file(filename):
 
 @app.route('/clear_all', methods=['POST'])
 def clear_all():
+    upload_catalog.clear()
     if os.path.exists(UPLOAD_FOLDER):
         for f in os.listdir(UPLOAD_FOLDER):
             try:
@@ -1085,6 +4089,80 @@ def clear_all():
     return index()
 
 
+# ============================================================
+# HEALTH & ADMIN ROUTES
+# ============================================================
+
+@app.route('/healthz')
+def healthz():
+    # Liveness: the process is up and serving requests. Never touches the models.
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz')
+def readyz():
+    # Readiness: inference can run without paying a cold model load.
+    if use_process_backend():
+        pool  = inference_pool.status()
+        ready = pool['started'] and pool['alive'] == pool['size']
+        return jsonify({'ready': ready, 'inference_pool': pool}), (200 if ready else 503)
+    ready = whisper_registry.is_loaded(WHISPER_MODEL_NAME)
+    return jsonify({'ready': ready, 'models': model_status()}), (200 if ready else 503)
+
+
+@app.route('/admin/warmup', methods=['POST'])
+@admin_required
+def admin_warmup():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    names = data.get('models') or ['whisper', 'bart']
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return jsonify({'error': "'models' must be a list of model names"}), 400
+    for name in names:
+        if name.startswith('whisper:'):
+            try:
+                resolve_whisper_model(name.split(':', 1)[1])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        elif name != 'whisper' and name not in MODEL_PROVIDERS:
+            return jsonify({'error': f"Unknown model: {name}"}), 400
+
+    # With the process backend every inference worker loads its own copy.
+    warmup = inference_pool.warmup if use_process_backend() else warmup_models
+
+    if request.args.get('wait') == '1':
+        return jsonify({'models': warmup(names)})
+
+    threading.Thread(target=warmup, args=(names,), name="model-warmup", daemon=True).start()
+    return jsonify({'message': 'Warm-up started', 'models': names}), 202
+
+
+@app.route('/admin/models')
+@admin_required
+def admin_models():
+    if use_process_backend():
+        return jsonify({'inference_pool': inference_pool.status()})
+    return jsonify(model_status())
+
+
+@app.route('/admin/render')
+@admin_required
+def admin_render():
+    return jsonify(render_pool.stats())
+
+
+@app.route('/admin/cache')
+@admin_required
+def admin_cache():
+    return jsonify({
+        'results':      result_cache.stats(),
+        'exports':      export_cache.stats(),
+        'pcm':          pcm_cache.stats(),
+        'translations': translation_memory.stats(),
+    })
+
+
 # ============================================================
 # CHATBOT ROUTE (Powered by Groq)
 # ============================================================
@@ -1106,7 +4184,7 @@ def chat_with_bot(current_user):
 TranscribeFlow is an AI audio transcription web app.
 
 Features & Workflows:
-- Supported Formats: ONLY local MP3 and WAV files (Max 50MB).
+- Supported Formats: ONLY local MP3 and WAV files (Max 1GB; large files upload in resumable chunks).
 - Upload Process: Users must drag & drop or click the "Select Audio" pod in the main dashboard, then click "Transcribe Now".
 - Cloud Integrations: None. We do NOT support YouTube, Tubi, Spotify, Google Drive, or Dropbox. Local files only.
 - Free users: trial access managed via IP.
@@ -0,0 +1,403 @@
+"""
+Multilingual PDF rendering for TranscribeFlow exports.
+
+Kept apart from app.py so PDF render workers only import ReportLab: a worker
+process never loads Flask, the databases or the inference stack.
+"""
+import os
+import threading
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.utils import simpleSplit
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Flowable
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont   # handles CJK with zero font files
+
+# Directory where TTF font files live (Arabic, Hindi, Latin only)
+# CJK languages use ReportLab's built-in CID fonts — no font files needed.
+FONTS_DIR = os.path.join(os.getcwd(), 'fonts')
+
+# ── CID fonts (built into every ReportLab installation) ──────────────────────
+# These are PDF standard CJK fonts. Zero external files required.
+# The PDF viewer on the end-user's machine supplies the actual glyphs,
+# which is why characters render correctly.
+CID_FONT_MAP = {
+    'ja':    'HeiseiKakuGo-W5',   # Japanese
+    'zh':    'STSong-Light',       # Chinese Simplified
+    'zh-cn': 'STSong-Light',       # Chinese Simplified
+    'zh-tw': 'STSong-Light',       # Chinese Traditional (best available built-in)
+    'ko':    'HYGothic-Medium',    # Korean
+}
+
+# ── TTF fonts (files must exist in FONTS_DIR) ─────────────────────────────────
+TTF_FONT_MAP = {
+    'NotoSansArabic':     'NotoSansArabic-Regular.ttf',
+    'NotoSansDevanagari': 'NotoSansDevanagari-Regular.ttf',
+    'NotoSans':           'NotoSans-Regular.ttf',
+}
+
+_cid_registered = set()
+_ttf_registered = set()
+_font_lock      = threading.RLock()   # pdfmetrics' registry is a plain dict
+
+
+def _register_cid(cid_name: str) -> bool:
+    """Register a CID font with pdfmetrics once. Returns True on success."""
+    with _font_lock:
+        return _register_cid_locked(cid_name)
+
+
+def _register_cid_locked(cid_name: str) -> bool:
+    if cid_name in _cid_registered:
+        return True
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(cid_name))
+        _cid_registered.add(cid_name)
+        print(f"Registered CID font: {cid_name}")
+        return True
+    except Exception as e:
+        print(f"WARNING: Could not register CID font '{cid_name}': {e}")
+        return False
+
+
+def _register_ttf(font_name: str) -> bool:
+    """Register a TTF font from FONTS_DIR with pdfmetrics once. Returns True on success."""
+    with _font_lock:
+        return _register_ttf_locked(font_name)
+
+
+def _register_ttf_locked(font_name: str) -> bool:
+    if font_name in _ttf_registered:
+        return True
+    filename = TTF_FONT_MAP.get(font_name)
+    if not filename:
+        return False
+    path = os.path.join(FONTS_DIR, filename)
+    if not os.path.exists(path):
+        print(f"WARNING: TTF font file not found: {path}  (run get_fonts.py to download it)")
+        return False
+    try:
+        pdfmetrics.registerFont(TTFont(font_name, path))
+        _ttf_registered.add(font_name)
+        print(f"Registered TTF font: {font_name}")
+        return True
+    except Exception as e:
+        print(f"WARNING: Could not register TTF font '{font_name}': {e}")
+        return False
+
+
+def preregister_fonts() -> None:
+    """Register every CID/TTF font up front so renders never pay for it."""
+    for cid_name in set(CID_FONT_MAP.values()):
+        _register_cid(cid_name)
+    for font_name in TTF_FONT_MAP:
+        _register_ttf(font_name)
+
+
+def _xml_escape(text: str) -> str:
+    """Escape &, <, > so ReportLab's XML Paragraph parser doesn't crash."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _get_font_config(language: str) -> dict:
+    """
+    Return rendering configuration for the given language code.
+
+    Returned dict keys:
+        font_name  – name to pass to ParagraphStyle
+        word_wrap  – 'CJK' for Japanese/Chinese/Korean, 'LTR' otherwise
+        alignment  – 0 = left, 2 = right (Arabic/RTL)
+        ok         – True if font registered successfully
+    """
+    lang = (language or 'en').lower().strip()
+
+    # ── CJK: use built-in CID fonts (no file needed) ──────────────────────
+    if lang in CID_FONT_MAP:
+        cid_name = CID_FONT_MAP[lang]
+        ok = _register_cid(cid_name)
+        return {
+            'font_name': cid_name if ok else 'Helvetica',
+            'word_wrap': 'CJK',
+            'alignment': 0,
+            'ok':        ok,
+        }
+
+    # ── Arabic / Persian / Urdu: TTF + right-align ────────────────────────
+    if lang in ('ar', 'fa', 'ur'):
+        ok = _register_ttf('NotoSansArabic')
+        return {
+            'font_name': 'NotoSansArabic' if ok else 'Helvetica',
+            'word_wrap': 'LTR',
+            'alignment': 2,   # right-align
+            'ok':        ok,
+        }
+
+    # ── Hindi / Devanagari: TTF ────────────────────────────────────────────
+    if lang == 'hi':
+        ok = _register_ttf('NotoSansDevanagari')
+        return {
+            'font_name': 'NotoSansDevanagari' if ok else 'Helvetica',
+            'word_wrap': 'LTR',
+            'alignment': 0,
+            'ok':        ok,
+        }
+
+    # ── Latin / default ───────────────────────────────────────────────────
+    ok = _register_ttf('NotoSans')
+    return {
+        'font_name': 'NotoSans' if ok else 'Helvetica',
+        'word_wrap': 'LTR',
+        'alignment': 0,
+        'ok':        ok,
+    }
+
+
+# Transcript lines are plain text, so they skip Paragraph's XML parsing and
+# rich-text line breaking: PDF_LINES_PER_BLOCK lines at a time are wrapped
+# with simpleSplit (per character for CJK) and drawn as plain strings.
+PDF_LINES_PER_BLOCK = max(1, int(os.getenv("PDF_LINES_PER_BLOCK", 50)))
+
+
+def _wrap_cjk(text: str, font_name: str, font_size: float, max_width: float) -> list:
+    rows, start, width = [], 0, 0.0
+    for i, ch in enumerate(text):
+        w = pdfmetrics.stringWidth(ch, font_name, font_size)
+        if width + w > max_width and i > start:
+            rows.append(text[start:i])
+            start, width = i, 0.0
+        width += w
+    rows.append(text[start:])
+    return rows
+
+
+class _LineBlock(Flowable):
+    """A run of transcript lines drawn as wrapped plain text; splits between rows."""
+
+    def __init__(self, lines, style, rows=None):
+        super().__init__()
+        self.lines  = lines
+        self.style  = style
+        self._rows  = rows      # [(text, space_after)] once wrapped
+        self._width = None
+
+    def _wrap_rows(self, width):
+        st, rows = self.style, []
+        for line in self.lines:
+            if st.wordWrap == 'CJK':
+                wrapped = _wrap_cjk(line, st.fontName, st.fontSize, width)
+            else:
+                wrapped = simpleSplit(line, st.fontName, st.fontSize, width) or ['']
+            rows.extend((row, 0) for row in wrapped[:-1])
+            rows.append((wrapped[-1], st.spaceAfter))
+        return rows
+
+    def _height(self, rows):
+        return sum(self.style.leading + gap for _, gap in rows)
+
+    def wrap(self, availWidth, availHeight):
+        if self._rows is None or (self.lines is not None and self._width != availWidth):
+            self._rows  = self._wrap_rows(availWidth)
+            self._width = availWidth
+        self.width, self.height = availWidth, self._height(self._rows)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        # A row's trailing gap counts towards what fits: a part must never be
+        # taller than availHeight, or ReportLab postpones it to the next frame.
+        used, n = 0, 0
+        for _, gap in self._rows:
+            if used + self.style.leading + gap > availHeight:
+                break
+            used += self.style.leading + gap
+            n    += 1
+        if n == len(self._rows):
+            n -= 1   # split was asked for, so always hand back a remainder
+        if n <= 0:
+            return []
+        return [_LineBlock(None, self.style, self._rows[:n]), _LineBlock(None, self.style, self._rows[n:])]
+
+    def draw(self):
+        st, canv = self.style, self.canv
+        canv.setFont(st.fontName, st.fontSize)
+        y = self.height - st.fontSize
+        for text, gap in self._rows:
+            if st.alignment == 2:
+                canv.drawRightString(self.width, y, text)
+            else:
+                canv.drawString(0, y, text)
+            y -= st.leading + gap
+
+
+class _LazyStory:
+    """
+    Flowable list for doc.build that creates transcript blocks on demand.
+
+    ReportLab consumes the story from the front (indexing, deleting and
+    re-inserting split parts at the head), so only a few Paragraphs exist
+    at any time instead of one per block for the whole document.
+    """
+
+    def __init__(self, head: list, block_count: int, make_block):
+        self._ready      = list(head)
+        self._next_block = 0
+        self._count      = block_count
+        self._make_block = make_block
+
+    def _fill(self, n=None):
+        while self._next_block < self._count and (n is None or len(self._ready) < n):
+            self._ready.append(self._make_block(self._next_block))
+            self._next_block += 1
+
+    def _fill_for(self, index):
+        if isinstance(index, slice):
+            stop = index.stop
+            self._fill(stop if stop is not None and stop >= 0 else None)
+        else:
+            self._fill(index + 1 if index >= 0 else None)
+
+    def __len__(self):
+        return len(self._ready) + self._count - self._next_block
+
+    def __getitem__(self, index):
+        self._fill_for(index)
+        return self._ready[index]
+
+    def __setitem__(self, index, value):
+        self._fill_for(index)
+        self._ready[index] = value
+
+    def __delitem__(self, index):
+        self._fill_for(index)
+        del self._ready[index]
+
+    def insert(self, index, value):
+        self._fill(index)
+        self._ready.insert(index, value)
+
+    def pop(self, index=-1):
+        self._fill_for(index)
+        return self._ready.pop(index)
+
+    def __iter__(self):
+        i = 0
+        while i < len(self):
+            yield self[i]
+            i += 1
+
+
+def create_multilingual_pdf(output, title: str,
+                             transcription: str, summary: str,
+                             language: str = 'en') -> int:
+    """
+    Build a properly-rendered multilingual PDF.
+
+    `output` is a file path or a writable binary file object (e.g. a
+    spooled buffer), so callers can render without touching a shared path.
+
+    CJK languages (ja, zh, zh-cn, zh-tw, ko) use ReportLab's built-in
+    CID fonts — no downloaded font files needed, guaranteed glyph rendering.
+
+    Arabic / Hindi use Noto TTF files from ./fonts/.
+    Latin falls back to NotoSans TTF or Helvetica.
+
+    Returns the number of pages rendered.
+    """
+    fc        = _get_font_config(language)
+    font_name = fc['font_name']
+    word_wrap = fc['word_wrap']
+    alignment = fc['alignment']
+
+    if not fc['ok']:
+        print(f"WARNING: Falling back to Helvetica for lang='{language}'. "
+              "Non-Latin characters may render as boxes.")
+
+    lang_label = language.upper() if language and language not in ('auto', '') else ''
+
+    # ── Paragraph styles ──────────────────────────────────────────────────
+    title_style = ParagraphStyle(
+        "TFTitle",
+        fontName=font_name,
+        fontSize=18,
+        leading=26,
+        alignment=1,           # always centre
+        spaceAfter=8,
+    )
+    heading_style = ParagraphStyle(
+        "TFHeading",
+        fontName=font_name,
+        fontSize=13,
+        leading=18,
+        alignment=alignment,
+        spaceBefore=12,
+        spaceAfter=4,
+    )
+    body_style = ParagraphStyle(
+        "TFBody",
+        fontName=font_name,
+        fontSize=10,
+        leading=15,
+        alignment=alignment,
+        wordWrap=word_wrap,
+        spaceAfter=3,
+    )
+
+    # ── Flowables ─────────────────────────────────────────────────────────
+    story = []
+    story.append(Paragraph(_xml_escape(title), title_style))
+    story.append(HRFlowable(width="100%", thickness=1, color="#00aacc"))
+    story.append(Spacer(1, 5 * mm))
+
+    summary_heading = f"Summary ({lang_label})" if lang_label else "Summary"
+    story.append(Paragraph(_xml_escape(summary_heading), heading_style))
+
+    if summary and summary.strip():
+        for para in summary.split('\n'):
+            if para.strip():
+                story.append(Paragraph(_xml_escape(para), body_style))
+    else:
+        story.append(Paragraph("No summary available.", body_style))
+
+    story.append(Spacer(1, 6 * mm))
+    story.append(HRFlowable(width="100%", thickness=0.5, color="#cccccc"))
+
+    transcript_heading = f"Transcript ({lang_label})" if lang_label else "Transcript"
+    story.append(Paragraph(_xml_escape(transcript_heading), heading_style))
+
+    lines = [line for line in transcription.split('\n') if line.strip()] if transcription else []
+    if not lines:
+        story.append(Paragraph("No transcription available.", body_style))
+
+    def make_block(i):
+        return _LineBlock(lines[i * PDF_LINES_PER_BLOCK:(i + 1) * PDF_LINES_PER_BLOCK], body_style)
+
+    block_count = -(-len(lines) // PDF_LINES_PER_BLOCK)
+
+    # ── Build ─────────────────────────────────────────────────────────────
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        rightMargin=20 * mm,
+        leftMargin=20 * mm,
+        topMargin=20 * mm,
+        bottomMargin=20 * mm,
+    )
+    doc.build(_LazyStory(story, block_count, make_block))
+    target = output if isinstance(output, str) else "<buffer>"
+    print(f"PDF generated: {target}  (font={font_name}, lang={language}, pages={doc.page})")
+    return doc.page
+
+
+def render_worker_init():
+    preregister_fonts()
+
+
+def render_pdf_task(output, title, transcription, summary, language):
+    """Render one PDF; returns (pages, seconds)."""
+    started = time.perf_counter()
+    pages   = create_multilingual_pdf(output, title, transcription, summary, language)
+    return pages, time.perf_counter() - started
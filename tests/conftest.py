@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """Import app.py once, with its databases, uploads/ and cache/ under a temp dir."""
+    workdir = tmp_path_factory.mktemp("app")
+    os.chdir(workdir)
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.app.config["TESTING"] = True
+    return app_module.app.test_client()
@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.mark.parametrize("body", [
+    {"models": "whisper"},
+    {"models": ["whisper", 3]},
+    {"models": {"whisper": True}},
+    ["whisper"],
+])
+def test_warmup_rejects_malformed_models(client, body):
+    resp = client.post("/admin/warmup", json=body)
+
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def test_warmup_rejects_unknown_model(client):
+    resp = client.post("/admin/warmup", json={"models": ["gpt"]})
+
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "Unknown model: gpt"}
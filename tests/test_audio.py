@@ -0,0 +1,29 @@
+import os
+
+
+def _upload(app_module, name, audio_hash, preview=False):
+    path = os.path.join(app_module.UPLOAD_FOLDER, name)
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + b"\0" * 64)
+    if preview:
+        with open(path + app_module.PREVIEW_SUFFIX, "wb") as f:
+            f.write(b"\0" * 32)
+    app_module.upload_catalog.upsert(name, path, audio_hash=audio_hash)
+
+
+def test_versioned_preview_is_immutable(app_module, client):
+    _upload(app_module, "with-preview.wav", "ab" * 32, preview=True)
+
+    response = client.get("/serve_audio/with-preview.wav?rendition=preview&v=abab")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == app_module.IMMUTABLE_CACHE
+
+
+def test_missing_preview_falls_back_uncached(app_module, client):
+    _upload(app_module, "no-preview.wav", "cd" * 32)
+
+    response = client.get("/serve_audio/no-preview.wav?rendition=preview&v=cdcd")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
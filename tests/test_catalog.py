@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def catalog(app_module, tmp_path):
+    catalog = app_module.UploadCatalog(str(tmp_path / "catalog.db"))
+    for i, name in enumerate(["a.wav", "b.wav", "c.wav", "d.wav", "e.wav"]):
+        path = tmp_path / name
+        path.write_bytes(b"\0" * 8)
+        catalog.upsert(name, str(path))
+        # Two uploads share a timestamp so the name breaks the tie.
+        catalog._conn().execute("UPDATE uploads SET uploaded_at = ? WHERE name = ?", (1000.5 + i // 2, name))
+    catalog._conn().commit()
+    return catalog
+
+
+def test_pages_walk_every_entry_once(catalog):
+    seen, cursor = [], None
+    while True:
+        entries, cursor = catalog.page(cursor, limit=2)
+        seen.extend(e["name"] for e in entries)
+        if cursor is None:
+            break
+
+    assert seen == ["e.wav", "d.wav", "c.wav", "b.wav", "a.wav"]
+
+
+def test_cursor_carries_exact_timestamp(catalog):
+    _, cursor = catalog.page(limit=1)
+    assert cursor == "1002.5|e.wav"
+
+
+def test_malformed_cursor_is_rejected(client):
+    assert client.get("/history?cursor=not-a-cursor").status_code == 400
@@ -0,0 +1,123 @@
+import hashlib
+import os
+
+import pytest
+
+AUDIO = os.urandom(3000)
+
+
+@pytest.fixture
+def queue(app_module, monkeypatch):
+    """Job scheduler stand-in recording submissions; set .full to make reserve() refuse them."""
+    class Queue:
+        def __init__(self):
+            self.full      = False
+            self.submitted = []
+
+        def is_full(self):
+            return False
+
+        def reserve(self):
+            return not self.full
+
+        def submit(self, job_id, fn, *args, reserved=False):
+            assert reserved
+            self.submitted.append(job_id)
+            return len(self.submitted)
+
+    q = Queue()
+    for name in ("is_full", "reserve", "submit"):
+        monkeypatch.setattr(app_module.job_scheduler, name, getattr(q, name))
+    monkeypatch.setattr(app_module, "schedule_media", lambda *a, **k: None)
+    return q
+
+
+def _init(client, name):
+    resp = client.post("/upload/chunked/init", json={"filename": name, "size": len(AUDIO)})
+    assert resp.status_code == 200
+    return resp.get_json()["upload_id"]
+
+
+def _put(client, upload_id, offset, data):
+    return client.put(f"/upload/chunked/{upload_id}", data=data, headers={"X-Upload-Offset": str(offset)})
+
+
+def _upload_all(client, upload_id):
+    for offset in range(0, len(AUDIO), 1000):
+        assert _put(client, upload_id, offset, AUDIO[offset:offset + 1000]).status_code == 200
+
+
+def test_finalize_hashes_assembled_file(app_module, client, queue):
+    upload_id = _init(client, "talk.wav")
+    _upload_all(client, upload_id)
+
+    resp = client.post(f"/upload/chunked/{upload_id}/finalize")
+
+    assert resp.status_code == 200
+    assert queue.submitted == ["talk.wav"]
+    entry = app_module.upload_catalog.get("talk.wav")
+    assert entry["audio_hash"] == hashlib.sha256(AUDIO).hexdigest()
+
+
+def test_append_while_busy_is_rejected(app_module, client, queue):
+    upload_id = _init(client, "busy.wav")
+
+    with app_module._upload_lock(upload_id) as locked:
+        assert locked
+        resp = _put(client, upload_id, 0, AUDIO[:1000])
+
+    assert resp.status_code == 409
+    assert resp.get_json()["offset"] == 0
+    assert _put(client, upload_id, 0, AUDIO[:1000]).status_code == 200
+    assert _put(client, upload_id, 0, AUDIO[:1000]).get_json() == {"error": "Offset mismatch", "offset": 1000}
+
+
+def test_finalize_is_idempotent(client, queue):
+    upload_id = _init(client, "twice.wav")
+    _upload_all(client, upload_id)
+
+    first  = client.post(f"/upload/chunked/{upload_id}/finalize")
+    second = client.post(f"/upload/chunked/{upload_id}/finalize")
+
+    assert first.status_code == second.status_code == 200
+    assert queue.submitted == ["twice.wav"]
+    assert second.get_json()["filename"] == "twice.wav"
+
+
+def test_queue_full_keeps_assembled_upload(app_module, client, queue):
+    upload_id = _init(client, "later.wav")
+    _upload_all(client, upload_id)
+    queue.full = True
+
+    assert client.post(f"/upload/chunked/{upload_id}/finalize").status_code == 503
+    assert not os.path.exists(os.path.join(app_module.UPLOAD_FOLDER, "later.wav"))
+    assert os.path.exists(app_module._partial_paths(upload_id)[1])   # kept for the retry
+
+    queue.full = False
+    assert client.post(f"/upload/chunked/{upload_id}/finalize").status_code == 200
+    assert queue.submitted == ["later.wav"]
+
+
+def _expire(app_module, upload_id):
+    old = os.path.getmtime(app_module._partial_paths(upload_id)[0]) - app_module.CHUNKED_UPLOAD_TTL_SEC - 60
+    os.utime(app_module._partial_paths(upload_id)[0], (old, old))
+
+
+def test_sweep_skips_locked_sessions_and_keeps_lock_files(app_module, client, queue):
+    busy = _init(client, "resumed.wav")
+    idle = _init(client, "abandoned.wav")
+    while int(idle[:8], 16) % 64 == int(busy[:8], 16) % 64:   # same thread-lock stripe
+        idle = _init(client, "abandoned.wav")
+    assert _put(client, busy, 0, AUDIO[:1000]).status_code == 200
+    assert _put(client, idle, 0, AUDIO[:1000]).status_code == 200
+    _expire(app_module, busy)
+    _expire(app_module, idle)
+
+    with app_module._upload_lock(busy) as locked:
+        assert locked
+        app_module._sweep_stale_uploads()
+
+    assert all(os.path.exists(p) for p in app_module._partial_paths(busy))
+    assert not any(os.path.exists(p) for p in app_module._partial_paths(idle))
+    for upload_id in (busy, idle):
+        assert os.path.exists(os.path.join(app_module.PARTIAL_FOLDER, upload_id + ".lock"))
@@ -0,0 +1,24 @@
+def test_heap_stays_bounded_under_rewrites(app_module):
+    store = app_module.ExpiringStore(max_entries=100)
+
+    for i in range(10_000):
+        store.set(f"user{i % 10}", {"otp": i}, ttl_sec=60)
+        if i % 3 == 0:
+            store.pop(f"user{i % 10}")
+
+    assert len(store) <= 10
+    assert len(store._heap) <= 2 * len(store) + 65
+
+
+def test_compaction_keeps_expiry_order(app_module):
+    store = app_module.ExpiringStore(max_entries=3)
+    for i in range(200):
+        store.set("hot", {"n": i}, ttl_sec=60)
+    store.set("soon", {}, ttl_sec=1)
+    store.set("late", {}, ttl_sec=120)
+
+    store.set("new", {}, ttl_sec=60)   # full: the soonest-expiring entry goes
+
+    assert store.get("soon") is None
+    assert store.get("hot") == {"n": 199}
+    assert store.get("late") == {}
@@ -0,0 +1,35 @@
+def test_etag_matches_any_content_coding(app_module):
+    for sent in ('"abc"', '"abc-gzip"', 'W/"abc-br"', '"zzz", "abc"', "*"):
+        with app_module.app.test_request_context(headers={"If-None-Match": sent}):
+            assert app_module._client_has_current("abc"), sent
+    with app_module.app.test_request_context(headers={"If-None-Match": '"abcd"'}):
+        assert not app_module._client_has_current("abc")
+
+
+def test_if_modified_since_compares_whole_seconds(app_module):
+    headers = {"If-Modified-Since": "Thu, 01 Jan 2026 00:00:00 GMT"}
+    with app_module.app.test_request_context(headers=headers):
+        assert app_module._client_has_current("abc", last_modified=1767225600.9)
+        assert not app_module._client_has_current("abc", last_modified=1767225601.0)
+        assert not app_module._client_has_current("abc")
+
+
+def test_not_modified_only_when_current(app_module):
+    with app_module.app.test_request_context(headers={"If-None-Match": '"abc"'}):
+        response = app_module.not_modified("abc", cache_control="private")
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"abc"'
+        assert response.headers["Cache-Control"] == "private"
+        assert app_module.not_modified("other") is None
+
+
+def test_cached_json_round_trip(app_module):
+    payload = {"items": list(range(5))}
+    with app_module.app.test_request_context():
+        first = app_module.cached_json(payload)
+    with app_module.app.test_request_context(headers={"If-None-Match": first.headers["ETag"]}):
+        again = app_module.cached_json(payload)
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+
@@ -0,0 +1,46 @@
+import concurrent.futures
+import time
+
+
+class FakeProcess:
+    exitcode = None
+
+    def __init__(self):
+        self.terminated = False
+
+    def is_alive(self):
+        return not self.terminated
+
+    def terminate(self):
+        self.terminated = True
+
+
+def _pool(app_module, monkeypatch, started, last_event):
+    pool = app_module.InferencePool(1, 1, 1, task_timeout=60)
+    proc = FakeProcess()
+    pool._workers[0] = (proc, None)
+    future = concurrent.futures.Future()
+    pool._tasks["t"] = {'worker': 0, 'future': future, 'on_event': None,
+                        'started': started, 'last_event': last_event}
+    respawned = []
+    monkeypatch.setattr(pool, "_spawn", respawned.append)
+    return pool, proc, future, respawned
+
+
+def test_task_streaming_events_is_not_stuck(app_module, monkeypatch):
+    now = time.time()
+    pool, proc, future, respawned = _pool(app_module, monkeypatch, started=now - 7200, last_event=now - 5)
+
+    pool._check_workers()
+
+    assert not proc.terminated and not respawned and not future.done()
+
+
+def test_silent_task_times_out(app_module, monkeypatch):
+    now = time.time()
+    pool, proc, future, respawned = _pool(app_module, monkeypatch, started=now - 120, last_event=now - 120)
+
+    pool._check_workers()
+
+    assert proc.terminated and respawned == [0]
+    assert "timed out" in str(future.exception())
@@ -0,0 +1,23 @@
+import threading
+
+
+def test_concurrent_publishers_never_raise_on_a_full_queue(app_module):
+    hub = app_module.JobEventHub(max_backlog=1)
+    q = hub.subscribe("job")
+    errors = []
+
+    def publish(n):
+        for i in range(2000):
+            try:
+                hub.publish("job", {"n": n, "i": i})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=publish, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert q.qsize() == 1
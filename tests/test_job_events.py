@@ -0,0 +1,20 @@
+def test_unknown_job_is_404(client):
+    resp = client.get("/jobs/no-such-job/events")
+    assert resp.status_code == 404
+    assert resp.get_json() == {"error": "Job not found"}
+
+
+def test_deleted_job_ends_the_stream(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.job_store, "shared", True)   # poll every second
+    app_module.set_job("vanishing.wav", {"status": "processing", "stage": "transcribing", "progress": 40})
+
+    resp = client.get("/jobs/vanishing.wav/events", buffered=False)
+    events = resp.response
+    first = next(events).decode()
+    assert first.startswith("event: stage")
+
+    app_module.delete_job("vanishing.wav")
+    rest = b"".join(events).decode()
+
+    assert "event: error" in rest
+    assert "Job not found" in rest
@@ -0,0 +1,24 @@
+import sqlite3
+
+import pytest
+
+
+def test_set_resets_segments_atomically(app_module, tmp_path, monkeypatch):
+    store = app_module.SQLiteJobStore(str(tmp_path / "jobs.db"), ttl_sec=3600)
+    store.set("job", {"status": "processing"})
+    store.append_segment("job", {"index": 0, "start": 0, "end": 1, "text": "old run"})
+
+    def failing_dumps(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    # The state write fails after the segment delete: neither may stick.
+    monkeypatch.setattr(app_module.json, "dumps", failing_dumps)
+    with pytest.raises(sqlite3.OperationalError):
+        store.set("job", {"status": "queued"})
+    monkeypatch.undo()
+
+    assert store.get("job")["status"] == "processing"
+    assert [s["text"] for s in store.segments("job")] == ["old run"]
+
+    store.set("job", {"status": "queued"})
+    assert store.segments("job") == []
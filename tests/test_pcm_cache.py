@@ -0,0 +1,63 @@
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+FAKE_FFMPEG = """#!{python}
+import sys
+import numpy as np
+src = sys.argv[sys.argv.index("-i") + 1]
+if src.endswith("broken.wav"):
+    sys.stderr.write("Invalid data found when processing input")
+    sys.exit(1)
+sys.stdout.buffer.write(np.arange(-5000, 5000, dtype=np.int16).tobytes())
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_decode_streams_into_npy(app_module, fake_ffmpeg, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "PCM_CHUNK_SAMPLES", 3000)   # several chunks, ragged last one
+    out = str(tmp_path / "audio.npy")
+
+    n = app_module.decode_audio("in.wav", out)
+
+    samples = np.load(out, mmap_mode="r")
+    assert n == len(samples) == 10000
+    assert samples.dtype == np.float32
+    np.testing.assert_array_equal(samples, np.arange(-5000, 5000, dtype=np.int16) / np.float32(32768.0))
+    assert not os.path.exists(out + ".s16")
+
+
+def test_ensure_returns_pinned_path(app_module, fake_ffmpeg, tmp_path):
+    cache = app_module.PcmCache(str(tmp_path / "pcm"), max_bytes=1)
+
+    path = cache.ensure("a" * 64, "in.wav")
+    try:
+        assert cache._pinned[path] == 1
+        assert os.path.exists(path)   # over budget, but pinned
+    finally:
+        cache._unpin(path)
+    assert not cache._pinned
+
+
+def test_failed_decode_leaves_nothing_behind(app_module, fake_ffmpeg, tmp_path):
+    cache = app_module.PcmCache(str(tmp_path / "pcm"), max_bytes=1 << 20)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        cache.ensure("b" * 64, "broken.wav")
+
+    assert os.listdir(cache.directory) == []
+    assert not cache._pinned
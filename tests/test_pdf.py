@@ -0,0 +1,60 @@
+import io
+import random
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from reportlab.lib.styles import ParagraphStyle
+
+import pdf_render
+
+
+def _style(**overrides):
+    params = dict(fontName="Helvetica", fontSize=10, leading=15, spaceAfter=3, wordWrap="LTR")
+    params.update(overrides)
+    return ParagraphStyle("T", **params)
+
+
+def _mixed_transcript(rng, n_lines, wrap_share):
+    lines = []
+    for i in range(n_lines):
+        words = 60 if rng.random() < wrap_share else 6
+        lines.append(f"[00:00:{i % 60:02d} - 00:00:{(i + 1) % 60:02d}] " + " ".join(["word"] * words))
+    return "\n".join(lines)
+
+
+def test_split_parts_never_exceed_available_height():
+    # Every row fits by leading alone, but not once the spaceAfter gaps are added.
+    block = pdf_render._LineBlock(["a", "b", "c", "d"], _style())
+    _, height = block.wrap(400, 1000)
+    avail = 4 * 15 + 2
+
+    parts = block.split(400, avail)
+
+    assert len(parts) == 2
+    assert parts[0].wrap(400, avail)[1] <= avail
+    assert sum(p.wrap(400, 1000)[1] for p in parts) == height
+
+
+def test_split_returns_nothing_when_no_row_fits():
+    block = pdf_render._LineBlock(["a", "b"], _style())
+    assert block.split(400, 10) == []
+
+
+@pytest.mark.parametrize("wrap_share", [0.05, 0.3, 0.5, 0.95])
+@pytest.mark.parametrize("seed", range(3))
+def test_mixed_wrap_transcript_renders(wrap_share, seed):
+    transcript = _mixed_transcript(random.Random(seed), 500, wrap_share)
+    buf = io.BytesIO()
+
+    pages = pdf_render.create_multilingual_pdf(buf, "Report", transcript, "Summary", "en")
+
+    assert pages > 1
+    assert buf.getvalue().startswith(b"%PDF")
+
+
+def test_cjk_lines_wrap_per_character():
+    rows = pdf_render._wrap_cjk("字" * 100, "Helvetica", 10, 100)
+    assert len(rows) > 1
+    assert "".join(rows) == "字" * 100
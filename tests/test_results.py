@@ -0,0 +1,23 @@
+import os
+
+
+def test_legacy_transcript_replaces_stale_segments(app_module, client):
+    name = "reused-name.wav"
+    app_module._write_results(name, "old summary", segments=[{"start": 0, "end": 1, "text": "old recording"}])
+    assert app_module.open_segments(name) is not None
+
+    app_module._write_results(name, "new summary", transcript="[00:00:00 - 00:00:02] new recording")
+
+    assert app_module.open_segments(name) is None
+    assert client.get(f"/transcripts/{name}/segments").status_code == 404
+
+
+def test_segments_replace_stale_transcript(app_module):
+    name = "reused-other.wav"
+    app_module._write_results(name, "old summary", transcript="old transcript")
+
+    app_module._write_results(name, "new summary", segments=[{"start": 0, "end": 1, "text": "new"}])
+
+    segs = app_module.open_segments(name)
+    assert [segs.text(i) for i in range(len(segs))] == ["new"]
+    assert not os.path.exists(os.path.join(app_module.UPLOAD_FOLDER, name + ".txt"))
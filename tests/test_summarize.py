@@ -0,0 +1,29 @@
+import pytest
+
+
+def test_dedup_ignores_case_and_whitespace(app_module):
+    summaries = ["The team agreed.", " the team  agreed. ", "", None, "Next steps.", "THE TEAM AGREED."]
+
+    assert app_module._dedup_summaries(summaries) == ["The team agreed.", "Next steps."]
+
+
+def test_summarize_text_drops_repeated_chunk_summaries(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_token_counter", lambda: lambda text: len(text.split()))
+    monkeypatch.setattr(app_module, "SUMM_CHUNK_TOKENS", 12)
+    monkeypatch.setattr(app_module.summary_batcher, "summarize",
+                        lambda texts: ["Looping audio." if i % 2 else "looping  audio. " for i, _ in enumerate(texts)])
+    text = " ".join(["This sentence is long enough to count as a chunk."] * 6)
+
+    assert app_module.summarize_text(text) == "looping  audio."
+
+
+@pytest.mark.parametrize("backend", [
+    lambda texts: texts[:-1],                                    # one result short
+    lambda texts: (_ for _ in ()).throw(RuntimeError("oom")),    # backend crashed
+])
+def test_batcher_fails_every_waiting_chunk(app_module, monkeypatch, backend):
+    monkeypatch.setattr(app_module, "_generate_summaries", backend)
+    batcher = app_module.SummaryBatcher(max_batch=4, wait_ms=0)
+
+    with pytest.raises(RuntimeError):
+        batcher.summarize(["one", "two", "three"])
@@ -0,0 +1,53 @@
+import pytest
+
+
+class FakeTranslator:
+    """Upper-cases text; merges lines when asked to, like real translators sometimes do."""
+
+    calls = []
+
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, text):
+        FakeTranslator.calls.append(text)
+        if "merge" in text and "\n" in text:
+            return text.replace("\n", " ").upper()
+        return text.upper()
+
+
+@pytest.fixture
+def fake_backend(app_module, monkeypatch):
+    FakeTranslator.calls = []
+    monkeypatch.setitem(app_module.TRANSLATOR_BACKENDS, "fake", FakeTranslator)
+    monkeypatch.setitem(app_module._rate_limiters, "fake", app_module.RateLimiter(0))   # no throttling
+    return FakeTranslator
+
+
+def test_segments_are_batched_and_prefixes_kept(app_module, fake_backend, monkeypatch):
+    monkeypatch.setattr(app_module, "TRANSLATE_MAX_CHARS", 14)
+    transcript = "\n".join(f"[00:00:0{i} - 00:00:0{i + 1}] line {i}" for i in range(6))
+
+    (translated,) = app_module.translate_texts([transcript], "xx", backend="fake")
+
+    assert translated.split("\n")[0] == "[00:00:00 - 00:00:01] LINE 0"
+    assert translated == "\n".join(f"[00:00:0{i} - 00:00:0{i + 1}] LINE {i}" for i in range(6))
+    assert len(fake_backend.calls) == 3                       # two 6-char segments per request
+    assert all("[" not in call for call in fake_backend.calls)
+
+
+def test_translation_memory_skips_known_segments(app_module, fake_backend):
+    app_module.translate_texts(["alpha\nbeta"], "yy", backend="fake")
+    fake_backend.calls.clear()
+
+    transcript, summary = app_module.translate_texts(["alpha\ngamma", "beta"], "yy", backend="fake")
+
+    assert (transcript, summary) == ("ALPHA\nGAMMA", "BETA")
+    assert fake_backend.calls == ["gamma"]
+
+
+def test_merged_lines_fall_back_to_one_request_per_segment(app_module, fake_backend):
+    (translated,) = app_module.translate_texts(["please merge\nthese lines"], "zz", backend="fake")
+
+    assert translated == "PLEASE MERGE\nTHESE LINES"
+    assert fake_backend.calls == ["please merge\nthese lines", "please merge", "these lines"]
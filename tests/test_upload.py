@@ -0,0 +1,46 @@
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture
+def scheduler(app_module, monkeypatch):
+    """A real JobScheduler whose jobs are recorded instead of run."""
+    sched = app_module.JobScheduler(num_workers=1, max_queue=1)
+    monkeypatch.setattr(sched, "_ensure_workers", lambda: None)
+    monkeypatch.setattr(app_module, "job_scheduler", sched)
+    monkeypatch.setattr(app_module, "schedule_media", lambda *a, **k: None)
+    return sched
+
+
+def _upload(client, name, data):
+    return client.post("/upload", data={"audio": (io.BytesIO(data), name)}, content_type="multipart/form-data")
+
+
+def test_full_queue_keeps_the_previous_upload(app_module, client, scheduler, monkeypatch):
+    path = os.path.join(app_module.UPLOAD_FOLDER, "meeting.wav")
+    with open(path, "wb") as f:
+        f.write(b"previous recording")
+    app_module.upload_catalog.upsert("meeting.wav", path, status="completed")
+    assert scheduler.reserve()   # another upload takes the only slot...
+    monkeypatch.setattr(scheduler, "is_full", lambda: False)   # ...after this one passed the early check
+
+    resp = _upload(client, "meeting.wav", b"new recording")
+
+    assert resp.status_code == 503
+    with open(path, "rb") as f:
+        assert f.read() == b"previous recording"
+    assert app_module.upload_catalog.get("meeting.wav")["status"] == "completed"
+    assert not [f for f in os.listdir(app_module.UPLOAD_FOLDER) if f.endswith(".tmp")]
+
+
+def test_accepted_upload_is_moved_into_place(app_module, client, scheduler):
+    resp = _upload(client, "fresh.wav", b"fresh recording")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["queue_position"] == 1
+    with open(os.path.join(app_module.UPLOAD_FOLDER, "fresh.wav"), "rb") as f:
+        assert f.read() == b"fresh recording"
+    assert scheduler.stats()["queued"] == 1
+    assert scheduler.is_full()
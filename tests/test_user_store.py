@@ -0,0 +1,58 @@
+import json
+import threading
+
+import pytest
+
+
+def _legacy(tmp_path, users):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps(users))
+    return str(path)
+
+
+def _user(email, user_id, phone=""):
+    return {"email": email, "user_id": user_id, "name": email.split("@")[0], "phone": phone,
+            "password_hash": "x", "registered_on": "2024-01-01 00:00:00"}
+
+
+def test_conflicting_records_are_skipped_not_fatal(app_module, tmp_path):
+    store = app_module.UserStore(str(tmp_path / "users.db"))
+    path = _legacy(tmp_path, {
+        "a@x.com": _user("a@x.com", "1", phone="+1 555 0100"),
+        "b@x.com": _user("b@x.com", "2", phone="+1 555 0100"),   # phone clash: phone dropped
+        "c@x.com": _user("c@x.com", "1"),                        # user_id clash: skipped
+    })
+
+    assert store.migrate_from_json(path) == 2
+    assert store.get("b@x.com")["phone"] == ""
+    assert store.get("c@x.com") is None
+    assert not (tmp_path / "users.json").exists()
+    assert (tmp_path / "users.json.migrated").exists()
+
+
+def test_failed_migration_commits_nothing(app_module, tmp_path, monkeypatch):
+    store = app_module.UserStore(str(tmp_path / "users.db"))
+    path = _legacy(tmp_path, {"a@x.com": _user("a@x.com", "1"), "b@x.com": {"name": "no id"}})
+    monkeypatch.setattr(app_module.uuid, "uuid4", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError):
+        store.migrate_from_json(path)
+
+    assert store.count() == 0
+    assert (tmp_path / "users.json").exists()   # retried on the next start
+
+
+def test_concurrent_workers_import_once(app_module, tmp_path):
+    db = str(tmp_path / "users.db")
+    path = _legacy(tmp_path, {f"u{i}@x.com": _user(f"u{i}@x.com", str(i)) for i in range(200)})
+    stores = [app_module.UserStore(db) for _ in range(4)]
+    results = []
+
+    threads = [threading.Thread(target=lambda s=s: results.append(s.migrate_from_json(path))) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == [0, 0, 0, 200]
+    assert stores[0].count() == 200
@@ -0,0 +1,41 @@
+def _seg(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+def test_windows_overlap_and_cover_the_audio(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "LONG_AUDIO_WINDOW_SEC", 10)
+    monkeypatch.setattr(app_module, "LONG_AUDIO_OVERLAP_SEC", 2)
+
+    windows = app_module.plan_windows(25, 1)
+
+    assert windows == [(0, 10), (8, 18), (16, 25)]
+
+
+def test_short_audio_is_one_window(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "LONG_AUDIO_WINDOW_SEC", 10)
+    assert app_module.plan_windows(4, 1) == [(0, 4)]
+
+
+def test_stitch_splits_overlaps_at_their_midpoint(app_module):
+    windows = [(0, 10), (8, 18)]   # overlap 8..10, midpoint 9
+    results = [
+        {"segments": [_seg(0, 4, "one"), _seg(4, 8.5, "two"), _seg(9.2, 10, "cut off")]},
+        {"segments": [_seg(0, 0.5, "two"), _seg(1.5, 5, "three"), _seg(5, 10, "four")]},
+    ]
+
+    merged = app_module.stitch_windows(windows, results, 1)
+
+    assert [s["text"] for s in merged] == ["one", "two", "three", "four"]
+    assert merged[2] == _seg(9.5, 13, "three")   # shifted by the window start
+
+
+def test_stitch_drops_repeated_boundary_line(app_module):
+    windows = [(0, 10), (8, 18)]
+    results = [
+        {"segments": [_seg(7, 8.9, "Hello there.")]},
+        {"segments": [_seg(1.0, 2, " hello there.")]},   # starts at 9.0, past the midpoint
+    ]
+
+    merged = app_module.stitch_windows(windows, results, 1)
+
+    assert [s["text"] for s in merged] == ["Hello there."]